@@ -22,12 +22,29 @@ Usage:
 
 import frappe
 from frappe import _
-from frappe.utils import now_datetime, add_days, getdate, get_datetime
+from frappe.utils import now_datetime, add_days, getdate, get_datetime, validate_email_address
 import json
+import re
+from collections import defaultdict
+
+from kairos.kairos.audience import clear_audience_preview_cache
+
+try:
+    # orjson ships with Frappe and decodes noticeably faster than the stdlib
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 # Setup logger for debugging
 logger = frappe.logger("kairos.invitations", allow_site=True, file_count=5)
 
+# Tokens are frappe.generate_hash(length=32) hex strings; anything far from
+# that shape cannot match an invite, so it is rejected before querying the DB.
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{20,64}$")
+
+# Seconds a get_invitation response is served from cache
+INVITATION_CACHE_TTL = 60
+
 
 @frappe.whitelist(allow_guest=True)
 def create_invitation(
@@ -79,7 +96,7 @@ def create_invitation(
             "expires_at": "2025-01-10T00:00:00"
         }
     """
-    logger.info(f"Creating invitation for email={email}, institution={institution}")
+    logger.info("Creating invitation for email=%s, institution=%s", email, institution)
 
     try:
         # Validate required fields
@@ -95,7 +112,7 @@ def create_invitation(
         # Parse students if it's a JSON string
         if isinstance(students, str):
             try:
-                students = json.loads(students)
+                students = json_loads(students)
             except json.JSONDecodeError:
                 frappe.throw(_("Invalid students format. Expected a JSON array."), frappe.ValidationError)
 
@@ -110,21 +127,35 @@ def create_invitation(
         if not frappe.db.exists("Institution", institution):
             frappe.throw(_("Institution {0} does not exist").format(institution), frappe.DoesNotExistError)
 
-        # Validate all students exist and belong to the institution
-        for student_id in students:
-            if not frappe.db.exists("Student", student_id):
-                frappe.throw(_("Student {0} does not exist").format(student_id), frappe.DoesNotExistError)
-
-            # Check if student belongs to the institution
-            student_institution = frappe.db.get_value("Student", student_id, "institution")
-            if student_institution != institution:
-                frappe.throw(
-                    _("Student {0} does not belong to institution {1}").format(student_id, institution),
-                    frappe.ValidationError
-                )
+        # Validate all students exist and belong to the institution (single query)
+        student_rows = frappe.get_all(
+            "Student",
+            filters={"name": ["in", students]},
+            fields=["name", "institution", "full_name"]
+        )
+        students_by_id = {row.name: row for row in student_rows}
+
+        missing = [student_id for student_id in students if student_id not in students_by_id]
+        if missing:
+            frappe.throw(
+                _("Student {0} does not exist").format(", ".join(missing)),
+                frappe.DoesNotExistError
+            )
+
+        wrong_institution = [
+            student_id for student_id, row in students_by_id.items()
+            if row.institution != institution
+        ]
+        if wrong_institution:
+            frappe.throw(
+                _("Student {0} does not belong to institution {1}").format(
+                    ", ".join(wrong_institution), institution
+                ),
+                frappe.ValidationError
+            )
 
         # Validate email format
-        frappe.utils.validate_email_address(email, throw=True)
+        validate_email_address(email, throw=True)
 
         # Calculate expiration date
         expires_at = add_days(now_datetime(), expiration_days)
@@ -138,16 +169,15 @@ def create_invitation(
 
         # Add students to the child table
         for student_id in students:
-            student_name = frappe.db.get_value("Student", student_id, "full_name")
             invite.append("student_ids", {
                 "student": student_id,
-                "student_name": student_name
+                "student_name": students_by_id[student_id].full_name
             })
 
         # The token is generated automatically in before_insert
         invite.insert(ignore_permissions=True)
 
-        logger.info(f"Invitation created successfully: {invite.name}, token={invite.token}")
+        logger.info("Invitation created successfully: %s, token=%s", invite.name, invite.token)
 
         return {
             "success": True,
@@ -161,7 +191,7 @@ def create_invitation(
     except frappe.DoesNotExistError:
         raise
     except Exception as e:
-        logger.error(f"Error creating invitation: {str(e)}")
+        logger.error("Error creating invitation: %s", e)
         frappe.throw(_("Failed to create invitation: {0}").format(str(e)))
 
 
@@ -217,44 +247,73 @@ def get_invitation(token: str) -> dict:
             }
         }
     """
-    logger.info(f"Getting invitation by token")
+    logger.info("Getting invitation by token")
 
     if not token:
         frappe.throw(_("Token is required"), frappe.MandatoryError)
 
-    # Find the invitation by token
-    invite_name = frappe.db.get_value("Guardian Invite", {"token": token}, "name")
+    if not _TOKEN_RE.match(token):
+        frappe.throw(_("Invitation not found or invalid token"), frappe.DoesNotExistError)
+
+    # Serve repeated opens of the accept page from cache while still valid
+    cache_key = _invitation_cache_key(token)
+    cached = frappe.cache().get_value(cache_key)
+    if cached:
+        expires_at = cached["invitation"]["expires_at"]
+        unexpired = not expires_at or get_datetime(expires_at) > now_datetime()
+        if not cached["invitation"]["is_valid"] or unexpired:
+            return cached
+
+    # Find the invitation by token, together with its institution name
+    invite = frappe.db.sql(
+        """
+        SELECT gi.name, gi.institution, gi.email, gi.used, gi.expires, i.institution_name
+        FROM `tabGuardian Invite` gi
+        LEFT JOIN `tabInstitution` i ON i.name = gi.institution
+        WHERE gi.token = %s
+        """,
+        (token,),
+        as_dict=True
+    )
 
-    if not invite_name:
+    if not invite:
         frappe.throw(_("Invitation not found or invalid token"), frappe.DoesNotExistError)
 
-    invite = frappe.get_doc("Guardian Invite", invite_name)
+    invite = invite[0]
+    institution_name = invite.institution_name
 
-    # Get institution name
-    institution_name = frappe.db.get_value("Institution", invite.institution, "institution_name")
+    # Build students list, looking up any missing names in one query
+    student_rows = _get_invite_students(invite.name)
+    missing = [row.student for row in student_rows if not row.student_name]
+    fallback_names = dict(frappe.get_all(
+        "Student",
+        filters={"name": ["in", missing]},
+        fields=["name", "full_name"],
+        as_list=True
+    )) if missing else {}
 
-    # Build students list
     students = []
-    for student_row in invite.student_ids:
+    for student_row in student_rows:
         students.append({
             "student_id": student_row.student,
-            "student_name": student_row.student_name or frappe.db.get_value("Student", student_row.student, "student_name")
+            "student_name": student_row.student_name or fallback_names.get(student_row.student)
         })
 
     # Determine status
+    now = now_datetime()
     status = "Pending"
     is_valid = True
 
     if invite.used:
         status = "Used"
         is_valid = False
-    elif invite.expires and get_datetime(invite.expires) < get_datetime(now_datetime()):
+    elif invite.expires and get_datetime(invite.expires) < now:
         status = "Expired"
         is_valid = False
 
-    logger.info(f"Invitation found: {invite.name}, status={status}, is_valid={is_valid}")
+    logger.info("Invitation found: %s, status=%s, is_valid=%s", invite.name, status, is_valid)
 
-    return {
+    response = {
         "success": True,
         "invitation": {
             "invitation_id": invite.name,
@@ -268,6 +327,10 @@ def get_invitation(token: str) -> dict:
         }
     }
 
+    frappe.cache().set_value(cache_key, response, expires_in_sec=INVITATION_CACHE_TTL)
+
+    return response
+
 
 @frappe.whitelist(allow_guest=True)
 def accept_invitation(token: str, user_email: str) -> dict:
@@ -306,7 +369,7 @@ def accept_invitation(token: str, user_email: str) -> dict:
             "students_linked": ["STU-00001", "STU-00002"]
         }
     """
-    logger.info(f"Accepting invitation for user_email={user_email}")
+    logger.info("Accepting invitation for user_email=%s", user_email)
 
     if not token:
         frappe.throw(_("Token is required"), frappe.MandatoryError)
@@ -314,27 +377,36 @@ def accept_invitation(token: str, user_email: str) -> dict:
     if not user_email:
         frappe.throw(_("User email is required"), frappe.MandatoryError)
 
+    if not _TOKEN_RE.match(token):
+        frappe.throw(_("Invitation not found or invalid token"), frappe.DoesNotExistError)
+
     # Validate email format
-    frappe.utils.validate_email_address(user_email, throw=True)
+    validate_email_address(user_email, throw=True)
 
-    # Find the invitation by token
-    invite_name = frappe.db.get_value("Guardian Invite", {"token": token}, "name")
+    # Find the invitation by token, reading only the fields needed to validate it.
+    # The row stays locked until the request transaction commits, so concurrent
+    # acceptances of the same token are serialized and the second sees used=1.
+    invite = frappe.db.get_value(
+        "Guardian Invite",
+        {"token": token},
+        ["name", "institution", "email", "used", "expires"],
+        as_dict=True,
+        for_update=True
+    )
 
-    if not invite_name:
+    if not invite:
         frappe.throw(_("Invitation not found or invalid token"), frappe.DoesNotExistError)
 
-    invite = frappe.get_doc("Guardian Invite", invite_name)
-
     # Check if invitation is valid (not used and not expired)
     if invite.used:
         frappe.throw(_("This invitation has already been used"), frappe.ValidationError)
 
-    if not invite.is_valid():
+    if invite.expires and get_datetime(invite.expires) < now_datetime():
         frappe.throw(_("This invitation has expired"), frappe.ValidationError)
 
     # Verify that the email matches (optional, but good for security)
     if invite.email.lower() != user_email.lower():
-        logger.warning(f"Email mismatch: invite.email={invite.email}, user_email={user_email}")
+        logger.warning("Email mismatch: invite.email=%s, user_email=%s", invite.email, user_email)
         # You can decide whether to enforce email matching
         # For now, we'll allow any email but log the mismatch
 
@@ -342,39 +414,41 @@ def accept_invitation(token: str, user_email: str) -> dict:
     guardian = _get_or_create_guardian(user_email)
 
     # Link guardian to students via Student Guardian
-    students_linked = []
-    for student_row in invite.student_ids:
-        student_id = student_row.student
-
-        # Check if relationship already exists
-        existing = frappe.db.exists("Student Guardian", {
-            "student": student_id,
-            "guardian": guardian.name
-        })
+    student_ids = [student_row.student for student_row in _get_invite_students(invite.name)]
+
+    # Fetch existing relationships and student names once for the whole set
+    existing_links = set(frappe.get_all(
+        "Student Guardian",
+        filters={"guardian": guardian.name, "student": ["in", student_ids]},
+        pluck="student"
+    )) if student_ids else set()
+    student_names = dict(frappe.get_all(
+        "Student",
+        filters={"name": ["in", student_ids]},
+        fields=["name", "full_name"],
+        as_list=True
+    )) if student_ids else {}
 
-        if not existing:
-            # Create Student Guardian relationship
-            student_guardian = frappe.new_doc("Student Guardian")
-            student_guardian.student = student_id
-            student_guardian.student_name = frappe.db.get_value("Student", student_id, "student_name")
-            student_guardian.guardian = guardian.name
-            student_guardian.guardian_name = guardian.full_name
-            student_guardian.relation = "Guardian"  # Default relation
-            student_guardian.can_pickup = 1
-            student_guardian.can_receive_communications = 1
-            student_guardian.is_primary = 0  # Not primary by default
-
-            student_guardian.insert(ignore_permissions=True)
-            students_linked.append(student_id)
-            logger.info(f"Linked guardian {guardian.name} to student {student_id}")
-        else:
-            logger.info(f"Relationship already exists between guardian {guardian.name} and student {student_id}")
-            students_linked.append(student_id)  # Still report as linked
-
-    # Mark invitation as used
-    invite.mark_as_used(guardian.name)
-
-    logger.info(f"Invitation accepted: guardian={guardian.name}, students_linked={students_linked}")
+    students_linked = []
+    new_links = []
+    for student_id in student_ids:
+        if student_id in existing_links:
+            logger.info(
+                "Relationship already exists between guardian %s and student %s", guardian.name, student_id
+            )
+        elif student_id not in new_links:
+            new_links.append(student_id)
+        students_linked.append(student_id)  # Existing links are still reported as linked
+
+    if new_links:
+        _link_guardian_to_students(guardian, new_links, student_names)
+        logger.info("Linked guardian %s to students %s", guardian.name, new_links)
+
+    # Mark invitation as used (the only step that needs the full document)
+    frappe.get_doc("Guardian Invite", invite.name).mark_as_used(guardian.name)
+    _clear_invitation_cache(token)
+
+    logger.info("Invitation accepted: guardian=%s, students_linked=%s", guardian.name, students_linked)
 
     return {
         "success": True,
@@ -412,16 +486,18 @@ def revoke_invitation(invitation_id: str) -> dict:
             "message": "Invitation GINV-00001 has been revoked"
         }
     """
-    logger.info(f"Revoking invitation: {invitation_id}")
+    logger.info("Revoking invitation: %s", invitation_id)
 
     if not invitation_id:
         frappe.throw(_("Invitation ID is required"), frappe.MandatoryError)
 
-    # Check if invitation exists
-    if not frappe.db.exists("Guardian Invite", invitation_id):
+    # Read only the fields needed to validate the revocation
+    invite = frappe.db.get_value("Guardian Invite", invitation_id, ["token", "used", "expires"], as_dict=True)
+
+    if not invite:
         frappe.throw(_("Invitation {0} does not exist").format(invitation_id), frappe.DoesNotExistError)
 
-    invite = frappe.get_doc("Guardian Invite", invitation_id)
+    now = now_datetime()
 
     # Check if the invitation can be revoked
     if invite.used:
@@ -430,17 +506,17 @@ def revoke_invitation(invitation_id: str) -> dict:
             frappe.ValidationError
         )
 
-    if invite.expires and get_datetime(invite.expires) < get_datetime(now_datetime()):
+    if invite.expires and get_datetime(invite.expires) < now:
         frappe.throw(
             _("Cannot revoke invitation {0}: it has already expired").format(invitation_id),
             frappe.ValidationError
         )
 
     # Revoke by setting expiration to now (making it expired)
-    invite.expires = now_datetime()
-    invite.save(ignore_permissions=True)
+    frappe.db.set_value("Guardian Invite", invitation_id, "expires", now)
+    _clear_invitation_cache(invite.token)
 
-    logger.info(f"Invitation {invitation_id} revoked successfully")
+    logger.info("Invitation %s revoked successfully", invitation_id)
 
     return {
         "success": True,
@@ -448,7 +524,43 @@ def revoke_invitation(invitation_id: str) -> dict:
     }
 
 
-def _get_or_create_guardian(email: str) -> "frappe.model.document.Document":
+def _invitation_cache_key(token: str) -> str:
+    """Cache key for the get_invitation response of a token."""
+    return f"guardian_invite_{token}"
+
+
+def _clear_invitation_cache(token: str | None) -> None:
+    """
+    Drop the cached get_invitation response for a token.
+
+    Should be called whenever an invitation is used, revoked, or resent.
+
+    Args:
+        token: The invitation token
+    """
+    if token:
+        frappe.cache().delete_value(_invitation_cache_key(token))
+
+
+def _get_invite_students(invite_name: str) -> list[dict]:
+    """
+    Get the students attached to an invitation without loading the document.
+
+    Args:
+        invite_name: The Guardian Invite document name
+
+    Returns:
+        list[dict]: Rows with student and student_name, in table order
+    """
+    return frappe.get_all(
+        "Guardian Invite Student",
+        filters={"parent": invite_name, "parenttype": "Guardian Invite"},
+        fields=["student", "student_name"],
+        order_by="idx asc"
+    )
+
+
+def _get_or_create_guardian(email: str) -> "frappe._dict | frappe.model.document.Document":
     """
     Get an existing Guardian by email or create a new one.
 
@@ -456,25 +568,30 @@ def _get_or_create_guardian(email: str) -> "frappe.model.document.Document":
         email: The email address to look up or create a Guardian for
 
     Returns:
-        Guardian document
+        frappe._dict with name and full_name for an existing Guardian,
+        or the newly created Guardian document
     """
-    # First, try to find an existing Guardian with this email
-    existing_guardian = frappe.db.get_value("Guardian", {"email": email}, "name")
-
-    if existing_guardian:
-        logger.info(f"Found existing guardian: {existing_guardian}")
-        return frappe.get_doc("Guardian", existing_guardian)
-
-    # Create a new Guardian
-    # Try to get user info if user exists
-    user_info = None
-    if frappe.db.exists("User", email):
-        user_info = frappe.db.get_value(
-            "User",
-            email,
-            ["first_name", "last_name", "mobile_no", "phone"],
-            as_dict=True
-        )
+    # Look up an existing Guardian and the matching User in one query
+    lookup = frappe.db.sql(
+        """
+        SELECT g.name AS guardian, g.full_name AS guardian_full_name,
+            u.name AS user, u.first_name, u.last_name, u.mobile_no, u.phone
+        FROM (SELECT %(email)s AS email) e
+        LEFT JOIN `tabGuardian` g ON g.email = e.email
+        LEFT JOIN `tabUser` u ON u.name = e.email
+        LIMIT 1
+        """,
+        {"email": email},
+        as_dict=True
+    )[0]
+
+    if lookup.guardian:
+        logger.info("Found existing guardian: %s", lookup.guardian)
+        # Callers only read name and full_name, so skip loading the document
+        return frappe._dict(name=lookup.guardian, full_name=lookup.guardian_full_name)
+
+    # Create a new Guardian, using the user info if the user exists
+    user_info = lookup if lookup.user else None
 
     guardian = frappe.new_doc("Guardian")
     guardian.email = email
@@ -491,11 +608,62 @@ def _get_or_create_guardian(email: str) -> "frappe.model.document.Document":
         guardian.mobile = ""
 
     guardian.insert(ignore_permissions=True)
-    logger.info(f"Created new guardian: {guardian.name}")
+    logger.info("Created new guardian: %s", guardian.name)
 
     return guardian
 
 
+def _link_guardian_to_students(guardian, student_ids: list[str], student_names: dict) -> None:
+    """
+    Create Student Guardian relationships for a guardian.
+
+    Rows are written with a single bulk INSERT. The Student Guardian controller
+    only guards against duplicates and multiple primaries, which the caller
+    already rules out (links are new and never primary). If another app hooks
+    into Student Guardian events, fall back to a regular insert per row so
+    those hooks still run.
+
+    Args:
+        guardian: Guardian document (or dict) with name and full_name
+        student_ids: Student IDs not yet linked to the guardian
+        student_names: Mapping of Student ID to full name
+    """
+    if (frappe.get_hooks("doc_events") or {}).get("Student Guardian"):
+        for student_id in student_ids:
+            student_guardian = frappe.new_doc("Student Guardian")
+            student_guardian.student = student_id
+            student_guardian.student_name = student_names.get(student_id)
+            student_guardian.guardian = guardian.name
+            student_guardian.guardian_name = guardian.full_name
+            student_guardian.relation = "Guardian"  # Default relation
+            student_guardian.can_pickup = 1
+            student_guardian.can_receive_communications = 1
+            student_guardian.is_primary = 0  # Not primary by default
+            student_guardian.insert(ignore_permissions=True)
+        return
+
+    now = now_datetime()
+    user = frappe.session.user
+    fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus",
+        "student", "student_name", "guardian", "guardian_name", "relation",
+        "can_pickup", "can_receive_communications", "is_primary"
+    ]
+    values = [
+        (
+            # Matches the DocType autoname: format:{student}-{guardian}
+            f"{student_id}-{guardian.name}", now, now, user, user, 0,
+            student_id, student_names.get(student_id), guardian.name, guardian.full_name, "Guardian",
+            1, 1, 0
+        )
+        for student_id in student_ids
+    ]
+    frappe.db.bulk_insert("Student Guardian", fields, values)
+
+    # The controller's on_update doesn't run for bulk inserts
+    clear_audience_preview_cache()
+
+
 # Additional utility endpoints
 
 @frappe.whitelist()
@@ -503,79 +671,176 @@ def list_invitations(
     institution: str | None = None,
     status: str | None = None,
     limit: int = 20,
-    offset: int = 0
+    offset: int = 0,
+    after_creation: str | None = None,
+    after_name: str | None = None
 ) -> dict:
     """
     List guardian invitations with optional filters.
 
+    Pages can be requested by offset or, preferably, by passing the values
+    of the previous page's next_cursor as after_creation and after_name
+    (keyset pagination), which stays fast regardless of how deep the page is.
+
     Args:
         institution: Filter by institution ID (optional)
         status: Filter by status - "Pending", "Used", "Expired" (optional)
         limit: Maximum number of results to return (default: 20)
-        offset: Number of results to skip (default: 0)
+        offset: Number of results to skip (default: 0, ignored when after_creation is given)
+        after_creation: Cursor creation; only return invitations ordered after it (optional)
+        after_name: Cursor name, breaking ties between invitations with the same creation (optional)
 
     Returns:
         dict: {
             success: bool,
             invitations: list[dict],
-            total: int
+            total: int | None (matching invitations; None when paging by cursor, reuse the first page's),
+            next_cursor: dict | None ({after_creation, after_name}; pass both to get the next page)
         }
     """
-    filters = {}
+    if after_creation:
+        offset = 0
+
+    conditions = []
+    values = {"limit": int(limit), "offset": int(offset), "now": now_datetime()}
 
     if institution:
-        filters["institution"] = institution
+        conditions.append("institution = %(institution)s")
+        values["institution"] = institution
+
+    if after_creation:
+        # (creation, name) so rows sharing the cursor's creation aren't skipped
+        conditions.append("(creation, name) < (%(after_creation)s, %(after_name)s)")
+        values["after_creation"] = after_creation
+        values["after_name"] = after_name or ""
 
     # Build filters based on status
     if status:
         if status == "Used":
-            filters["used"] = 1
+            conditions.append("used = 1")
         elif status == "Pending":
-            filters["used"] = 0
-            filters["expires"] = [">", now_datetime()]
+            conditions.append("used = 0 AND expires > %(now)s")
         elif status == "Expired":
-            filters["used"] = 0
-            filters["expires"] = ["<=", now_datetime()]
+            conditions.append("used = 0 AND expires <= %(now)s")
+
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    # Get invitations and the total count in one round trip. Cursor pages
+    # skip the count: it would only cover the rows after the cursor
+    total_column = "" if after_creation else ", COUNT(*) OVER () AS total_count"
+    invitations = frappe.db.sql(
+        f"""
+        SELECT
+            name, token, email, institution, expires,
+            used, used_at, guardian, created_by_user, creation,
+            CASE
+                WHEN used = 1 THEN 'Used'
+                WHEN expires <= %(now)s THEN 'Expired'
+                ELSE 'Pending'
+            END AS status
+            {total_column}
+        FROM `tabGuardian Invite`
+        {where_clause}
+        ORDER BY creation DESC, name DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+        """,
+        values,
+        as_dict=True
+    )
 
-    # Get total count
-    count_filters = dict(filters)
-    total = frappe.db.count("Guardian Invite", filters=count_filters)
+    if after_creation:
+        total = None
+    elif invitations:
+        total = invitations[0].total_count
+    elif offset:
+        # Page past the end: the window count has no row to ride on
+        total = frappe.db.sql(
+            f"SELECT COUNT(*) FROM `tabGuardian Invite` {where_clause}", values
+        )[0][0]
+    else:
+        total = 0
 
-    # Get invitations
-    invitations = frappe.get_all(
-        "Guardian Invite",
-        filters=filters,
-        fields=[
-            "name", "token", "email", "institution", "expires",
-            "used", "used_at", "guardian", "created_by_user", "creation"
-        ],
-        order_by="creation desc",
-        limit_page_length=limit,
-        start=offset
-    )
+    for inv in invitations:
+        inv.pop("total_count", None)
+
+    # Preload institution names and invited students for the whole page
+    institution_ids = list({inv["institution"] for inv in invitations if inv["institution"]})
+    institution_names = dict(frappe.get_all(
+        "Institution",
+        filters={"name": ["in", institution_ids]},
+        fields=["name", "institution_name"],
+        as_list=True
+    )) if institution_ids else {}
+
+    students_by_invite = defaultdict(list)
+    if invitations:
+        for row in frappe.get_all(
+            "Guardian Invite Student",
+            filters={"parent": ["in", [inv["name"] for inv in invitations]]},
+            fields=["parent", "student", "student_name"],
+            order_by="idx asc"
+        ):
+            students_by_invite[row.pop("parent")].append(row)
 
-    # Enrich with institution names and status
+    # Enrich with institution names and students (status comes from the query)
     for inv in invitations:
-        inv["institution_name"] = frappe.db.get_value("Institution", inv["institution"], "institution_name")
+        inv["institution_name"] = institution_names.get(inv["institution"])
+        inv["students"] = students_by_invite[inv["name"]]
 
-        if inv["used"]:
-            inv["status"] = "Used"
-        elif inv["expires"] and get_datetime(inv["expires"]) < get_datetime(now_datetime()):
-            inv["status"] = "Expired"
-        else:
-            inv["status"] = "Pending"
+    return {
+        "success": True,
+        "invitations": invitations,
+        "total": total,
+        "next_cursor": {
+            "after_creation": str(invitations[-1]["creation"]),
+            "after_name": invitations[-1]["name"]
+        } if len(invitations) == int(limit) else None
+    }
 
-        # Get students
-        inv["students"] = frappe.get_all(
-            "Guardian Invite Student",
-            filters={"parent": inv["name"]},
-            fields=["student", "student_name"]
-        )
+
+@frappe.whitelist()
+def invitation_stats(institution: str | None = None) -> dict:
+    """
+    Count guardian invitations per status in a single aggregate query.
+
+    Args:
+        institution: Filter by institution ID (optional)
+
+    Returns:
+        dict: {
+            success: bool,
+            stats: {"Pending": int, "Used": int, "Expired": int}
+        }
+    """
+    values = {"now": now_datetime()}
+    where_clause = ""
+
+    if institution:
+        where_clause = "WHERE institution = %(institution)s"
+        values["institution"] = institution
+
+    rows = frappe.db.sql(
+        f"""
+        SELECT
+            CASE
+                WHEN used = 1 THEN 'Used'
+                WHEN expires <= %(now)s THEN 'Expired'
+                ELSE 'Pending'
+            END AS status,
+            COUNT(*) AS count
+        FROM `tabGuardian Invite`
+        {where_clause}
+        GROUP BY status
+        """,
+        values
+    )
+
+    stats = {"Pending": 0, "Used": 0, "Expired": 0}
+    stats.update(dict(rows))
 
     return {
         "success": True,
-        "invitations": invitations,
-        "total": total
+        "stats": stats
     }
 
 
@@ -602,15 +867,15 @@ def resend_invitation(invitation_id: str, new_expiration_days: int = 7) -> dict:
         frappe.DoesNotExistError: If the invitation doesn't exist
         frappe.ValidationError: If the invitation has already been used
     """
-    logger.info(f"Resending invitation: {invitation_id}")
+    logger.info("Resending invitation: %s", invitation_id)
 
     if not invitation_id:
         frappe.throw(_("Invitation ID is required"), frappe.MandatoryError)
 
-    if not frappe.db.exists("Guardian Invite", invitation_id):
-        frappe.throw(_("Invitation {0} does not exist").format(invitation_id), frappe.DoesNotExistError)
+    invite = frappe.db.get_value("Guardian Invite", invitation_id, ["name", "token", "used"], as_dict=True)
 
-    invite = frappe.get_doc("Guardian Invite", invitation_id)
+    if not invite:
+        frappe.throw(_("Invitation {0} does not exist").format(invitation_id), frappe.DoesNotExistError)
 
     if invite.used:
         frappe.throw(
@@ -620,10 +885,10 @@ def resend_invitation(invitation_id: str, new_expiration_days: int = 7) -> dict:
 
     # Update expiration date
     new_expires = add_days(now_datetime(), new_expiration_days)
-    invite.expires = new_expires
-    invite.save(ignore_permissions=True)
+    frappe.db.set_value("Guardian Invite", invitation_id, "expires", new_expires)
+    _clear_invitation_cache(invite.token)
 
-    logger.info(f"Invitation {invitation_id} resent with new expiration: {new_expires}")
+    logger.info("Invitation %s resent with new expiration: %s", invitation_id, new_expires)
 
     return {
         "success": True,
@@ -69,9 +69,9 @@ fixtures = [
     "Custom Field",
     "Property Setter",
     {"dt": "Workspace", "filters": [["module", "=", "Kairos"]]},
-    {"dt": "Custom DocPerm", "filters": [
-        ["role", "in", ["School Admin", "School Manager", "Teacher", "Secretary", "Parent", "Student"]]
-    ]}
+    {"dt": "Custom DocPerm", "filters": {
+        "role": ["in", ["School Admin", "School Manager", "Teacher", "Secretary", "Parent", "Student"]]
+    }}
 ]
 
 # Installation
@@ -91,12 +91,15 @@ fixtures = [
 
 doc_events = {
     "*": {
-        # Check trial access before any write operation
-        "before_insert": "kairos.kairos.middleware.trial_access.check_trial_write_access",
+        # Check trial access before any write operation. before_save also
+        # runs on insert, and none of the trial-protected doctypes are
+        # submittable, so submit/cancel events are not needed.
         "before_save": "kairos.kairos.middleware.trial_access.check_trial_write_access",
-        "before_submit": "kairos.kairos.middleware.trial_access.check_trial_write_access",
-        "before_cancel": "kairos.kairos.middleware.trial_access.check_trial_write_access",
         "on_trash": "kairos.kairos.middleware.trial_access.check_trial_write_access",
+    },
+    "Institution": {
+        # Invalidate cached trial status whenever an institution changes
+        "on_update": "kairos.kairos.api.trial.clear_trial_cache_doc",
     }
 }
 
@@ -8,13 +8,42 @@ This module provides API endpoints for managing trial accounts,
 including status verification, trial extension, and conversion.
 """
 
+from datetime import datetime
+from functools import wraps
+
 import frappe
-from frappe import _
-from frappe.utils import now_datetime, add_days, get_datetime, time_diff_in_seconds
+from frappe import _, _lt
+from frappe.utils import now_datetime, add_days, get_datetime
 
 # Import constants from tasks module
 from kairos.kairos.tasks.trial_expiration import TRIAL_DURATION_DAYS, TRIAL_WARNING_DAYS
 
+from kairos.kairos.middleware.trial_access import clear_trial_cache as _clear_trial_cache
+from kairos.kairos.utils import get_user_roles
+
+_SECONDS_PER_DAY = 86400
+_WARNING_SECONDS = TRIAL_WARNING_DAYS * _SECONDS_PER_DAY
+
+
+def _require_system_manager(message):
+    """
+    Restrict an endpoint to System Managers.
+
+    System Manager is the only role with write access on Institution, so
+    this single role check also covers the document permission.
+
+    Args:
+        message: Lazily translated error shown to other users
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if "System Manager" not in get_user_roles():
+                frappe.throw(str(message), frappe.PermissionError)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
 
 @frappe.whitelist()
 def get_trial_status(institution=None):
@@ -53,8 +82,25 @@ def get_trial_status(institution=None):
     if not frappe.has_permission("Institution", "read", institution):
         frappe.throw(_("You don't have permission to view this institution"), frappe.PermissionError)
 
-    # Get institution data
-    inst = frappe.get_doc("Institution", institution)
+    # Get institution data from cache; derived values below are recomputed
+    # on every call so the cached fields stay valid for the whole TTL
+    cache_key = _trial_status_cache_key(institution)
+    inst = frappe.cache().get_value(cache_key)
+
+    if inst is None:
+        # Only the fields we need, no child tables
+        inst = frappe.db.get_value(
+            "Institution",
+            institution,
+            ["is_trial", "trial_status", "trial_started_at", "trial_expires_at", "institution_name"],
+            as_dict=True
+        )
+
+        if not inst:
+            frappe.throw(_("Institution {0} not found").format(institution), frappe.DoesNotExistError)
+
+        # Cache for 5 minutes
+        frappe.cache().set_value(cache_key, inst, expires_in_sec=300)
 
     if not inst.is_trial:
         return {
@@ -64,16 +110,16 @@ def get_trial_status(institution=None):
         }
 
     current_time = now_datetime()
-    expires_at = get_datetime(inst.trial_expires_at) if inst.trial_expires_at else None
+    expires_at = _as_datetime(inst.trial_expires_at)
 
     if expires_at:
-        time_diff = time_diff_in_seconds(expires_at, current_time)
-        days_remaining = int(time_diff / 86400)  # 86400 seconds in a day
+        remaining_seconds = (expires_at - current_time).total_seconds()
     else:
-        days_remaining = 0
+        remaining_seconds = 0
 
+    days_remaining = int(remaining_seconds // _SECONDS_PER_DAY)
     is_expired = inst.trial_status == "Expired" or (expires_at and expires_at < current_time)
-    is_warning_period = not is_expired and days_remaining <= TRIAL_WARNING_DAYS
+    is_warning_period = not is_expired and remaining_seconds <= _WARNING_SECONDS
 
     return {
         "is_trial": True,
@@ -90,6 +136,7 @@ def get_trial_status(institution=None):
 
 
 @frappe.whitelist()
+@_require_system_manager(_lt("Only System Managers can extend trial periods"))
 def extend_trial(institution, days=7):
     """
     Extend the trial period for an institution.
@@ -111,17 +158,6 @@ def extend_trial(institution, days=7):
         frappe.PermissionError: If user doesn't have admin permission
         frappe.ValidationError: If days is invalid or institution not on trial
     """
-    # Validate permission - only System Manager can extend trials
-    if not frappe.has_permission("Institution", "write"):
-        frappe.throw(_("You don't have permission to extend trials"), frappe.PermissionError)
-
-    # Additional role check for security
-    if "System Manager" not in frappe.get_roles():
-        frappe.throw(
-            _("Only System Managers can extend trial periods"),
-            frappe.PermissionError
-        )
-
     # Validate days parameter
     try:
         days = int(days)
@@ -131,8 +167,16 @@ def extend_trial(institution, days=7):
     if days < 1 or days > 30:
         frappe.throw(_("Days must be between 1 and 30"), frappe.ValidationError)
 
-    # Get institution
-    inst = frappe.get_doc("Institution", institution)
+    # Get institution (only the fields we need, no child tables)
+    inst = frappe.db.get_value(
+        "Institution",
+        institution,
+        ["is_trial", "trial_status", "trial_expires_at", "institution_name"],
+        as_dict=True
+    )
+
+    if not inst:
+        frappe.throw(_("Institution {0} not found").format(institution), frappe.DoesNotExistError)
 
     if not inst.is_trial:
         frappe.throw(
@@ -148,20 +192,26 @@ def extend_trial(institution, days=7):
 
     # Calculate new expiration date
     current_time = now_datetime()
-    current_expires = get_datetime(inst.trial_expires_at) if inst.trial_expires_at else current_time
+    current_expires = _as_datetime(inst.trial_expires_at) or current_time
 
     # If already expired, extend from now; otherwise extend from current expiration
     base_time = max(current_expires, current_time)
     new_expires_at = add_days(base_time, days)
 
     # Update institution
-    inst.trial_expires_at = new_expires_at
-    inst.trial_status = "Active"  # Reactivate if was expired
-    inst.save(ignore_permissions=True)
+    frappe.db.set_value(
+        "Institution",
+        institution,
+        {
+            "trial_expires_at": new_expires_at,
+            "trial_status": "Active"  # Reactivate if was expired
+        },
+        update_modified=True
+    )
+    clear_trial_cache(institution)
 
     # Calculate total days remaining
-    time_diff = time_diff_in_seconds(new_expires_at, current_time)
-    total_days_remaining = int(time_diff / 86400)
+    total_days_remaining = (new_expires_at - current_time).days
 
     # Log the extension
     frappe.logger().info(
@@ -169,15 +219,12 @@ def extend_trial(institution, days=7):
     )
 
     # Create activity log
-    frappe.get_doc({
-        "doctype": "Comment",
-        "comment_type": "Info",
-        "reference_doctype": "Institution",
-        "reference_name": institution,
-        "content": _("Trial extended by {0} days. New expiration: {1}").format(
+    _add_trial_comment(
+        institution,
+        _("Trial extended by {0} days. New expiration: {1}").format(
             days, frappe.format(new_expires_at, "Datetime")
         )
-    }).insert(ignore_permissions=True)
+    )
 
     return {
         "success": True,
@@ -191,6 +238,7 @@ def extend_trial(institution, days=7):
 
 
 @frappe.whitelist()
+@_require_system_manager(_lt("Only System Managers can convert trial accounts"))
 def convert_trial_to_paid(institution, plan_type="Standard"):
     """
     Convert a trial institution to a paid subscription.
@@ -208,18 +256,16 @@ def convert_trial_to_paid(institution, plan_type="Standard"):
         frappe.PermissionError: If user doesn't have admin permission
         frappe.ValidationError: If institution not on trial
     """
-    # Validate permission
-    if not frappe.has_permission("Institution", "write"):
-        frappe.throw(_("You don't have permission to convert trials"), frappe.PermissionError)
-
-    if "System Manager" not in frappe.get_roles():
-        frappe.throw(
-            _("Only System Managers can convert trial accounts"),
-            frappe.PermissionError
-        )
+    # Get institution (only the fields we need, no child tables)
+    inst = frappe.db.get_value(
+        "Institution",
+        institution,
+        ["is_trial", "trial_status", "institution_name"],
+        as_dict=True
+    )
 
-    # Get institution
-    inst = frappe.get_doc("Institution", institution)
+    if not inst:
+        frappe.throw(_("Institution {0} not found").format(institution), frappe.DoesNotExistError)
 
     if not inst.is_trial:
         frappe.throw(
@@ -233,9 +279,24 @@ def convert_trial_to_paid(institution, plan_type="Standard"):
             frappe.ValidationError
         )
 
-    # Update trial status
-    inst.trial_status = "Converted"
-    inst.save(ignore_permissions=True)
+    # Update trial status only if it is still an unconverted trial, so when
+    # two conversions race exactly one of them changes the row
+    frappe.db.sql(
+        """
+        UPDATE `tabInstitution`
+        SET trial_status = 'Converted', modified = %(modified)s, modified_by = %(user)s
+        WHERE name = %(institution)s AND is_trial = 1 AND IFNULL(trial_status, '') != 'Converted'
+        """,
+        {"modified": now_datetime(), "user": frappe.session.user, "institution": institution},
+    )
+
+    if not frappe.db._cursor.rowcount:
+        frappe.throw(
+            _("Institution has already been converted to a paid plan"),
+            frappe.ValidationError
+        )
+
+    clear_trial_cache(institution)
 
     # Log the conversion
     frappe.logger().info(
@@ -243,13 +304,10 @@ def convert_trial_to_paid(institution, plan_type="Standard"):
     )
 
     # Create activity log
-    frappe.get_doc({
-        "doctype": "Comment",
-        "comment_type": "Info",
-        "reference_doctype": "Institution",
-        "reference_name": institution,
-        "content": _("Trial converted to paid subscription. Plan: {0}").format(plan_type)
-    }).insert(ignore_permissions=True)
+    _add_trial_comment(
+        institution,
+        _("Trial converted to paid subscription. Plan: {0}").format(plan_type)
+    )
 
     return {
         "success": True,
@@ -261,6 +319,7 @@ def convert_trial_to_paid(institution, plan_type="Standard"):
 
 
 @frappe.whitelist()
+@_require_system_manager(_lt("Only System Managers can start trial periods"))
 def start_trial(institution, duration_days=None):
     """
     Start a trial period for an institution.
@@ -276,18 +335,16 @@ def start_trial(institution, duration_days=None):
         frappe.PermissionError: If user doesn't have admin permission
         frappe.ValidationError: If institution already has active trial
     """
-    # Validate permission
-    if not frappe.has_permission("Institution", "write"):
-        frappe.throw(_("You don't have permission to start trials"), frappe.PermissionError)
-
-    if "System Manager" not in frappe.get_roles():
-        frappe.throw(
-            _("Only System Managers can start trial periods"),
-            frappe.PermissionError
-        )
+    # Get institution (only the fields we need, no child tables)
+    inst = frappe.db.get_value(
+        "Institution",
+        institution,
+        ["is_trial", "trial_status", "institution_name"],
+        as_dict=True
+    )
 
-    # Get institution
-    inst = frappe.get_doc("Institution", institution)
+    if not inst:
+        frappe.throw(_("Institution {0} not found").format(institution), frappe.DoesNotExistError)
 
     if inst.is_trial and inst.trial_status == "Active":
         frappe.throw(
@@ -310,11 +367,18 @@ def start_trial(institution, duration_days=None):
     start_time = now_datetime()
     expires_at = add_days(start_time, duration_days)
 
-    inst.is_trial = 1
-    inst.trial_status = "Active"
-    inst.trial_started_at = start_time
-    inst.trial_expires_at = expires_at
-    inst.save(ignore_permissions=True)
+    frappe.db.set_value(
+        "Institution",
+        institution,
+        {
+            "is_trial": 1,
+            "trial_status": "Active",
+            "trial_started_at": start_time,
+            "trial_expires_at": expires_at
+        },
+        update_modified=True
+    )
+    clear_trial_cache(institution)
 
     # Log the trial start
     frappe.logger().info(
@@ -322,15 +386,12 @@ def start_trial(institution, duration_days=None):
     )
 
     # Create activity log
-    frappe.get_doc({
-        "doctype": "Comment",
-        "comment_type": "Info",
-        "reference_doctype": "Institution",
-        "reference_name": institution,
-        "content": _("Trial period started. Duration: {0} days. Expires: {1}").format(
+    _add_trial_comment(
+        institution,
+        _("Trial period started. Duration: {0} days. Expires: {1}").format(
             duration_days, frappe.format(expires_at, "Datetime")
         )
-    }).insert(ignore_permissions=True)
+    )
 
     return {
         "success": True,
@@ -372,6 +433,7 @@ def check_trial_access(institution=None):
         }
 
     if not institution:
+        # Memoized per request, so repeated checks don't re-read the User
         institution = _get_user_institution()
 
     if not institution:
@@ -406,14 +468,7 @@ def check_trial_access(institution=None):
                 "message": _("Institution not found")
             }
 
-        is_trial = inst_data.is_trial
-        is_expired = inst_data.trial_status == "Expired"
-
-        cached_status = {
-            "is_trial": is_trial,
-            "is_expired": is_expired,
-            "trial_status": inst_data.trial_status
-        }
+        cached_status = _get_trial_access_status(inst_data)
 
         # Cache for 5 minutes
         frappe.cache().set_value(cache_key, cached_status, expires_in_sec=300)
@@ -439,6 +494,57 @@ def check_trial_access(institution=None):
     }
 
 
+def _as_datetime(value):
+    """
+    Return a datetime field value as a datetime, or None if empty.
+
+    Values read from the database are usually datetimes already, so only
+    strings go through get_datetime.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return get_datetime(value)
+
+
+def _get_trial_access_status(inst_data):
+    """
+    Build the cacheable trial access status from Institution fields.
+
+    Args:
+        inst_data: dict with is_trial and trial_status
+
+    Returns:
+        dict: is_trial, is_expired and trial_status
+    """
+    return {
+        "is_trial": inst_data.is_trial,
+        "is_expired": inst_data.trial_status == "Expired",
+        "trial_status": inst_data.trial_status
+    }
+
+
+def _add_trial_comment(institution, content):
+    """
+    Add an Info comment to the Institution timeline.
+
+    The institution was already read by the caller, so link validation
+    is skipped to avoid another lookup.
+
+    Args:
+        institution: Institution name/ID
+        content: Comment text
+    """
+    frappe.get_doc({
+        "doctype": "Comment",
+        "comment_type": "Info",
+        "reference_doctype": "Institution",
+        "reference_name": institution,
+        "content": content
+    }).insert(ignore_permissions=True, ignore_links=True)
+
+
 def _get_user_institution():
     """
     Get the institution associated with the current user.
@@ -446,11 +552,21 @@ def _get_user_institution():
     Returns:
         str or None: Institution name or None if not found
     """
-    if frappe.session.user == "Guest":
+    user = frappe.session.user
+    if user == "Guest":
         return None
 
-    # Try to get institution from User document (if linked)
-    user_institution = frappe.db.get_value("User", frappe.session.user, "institution")
+    # Memoize per request: frappe.local is reset for every request, so this
+    # avoids repeated User lookups without any cache invalidation
+    cache = getattr(frappe.local, "kairos_user_institution", None)
+    if cache is None:
+        cache = frappe.local.kairos_user_institution = {}
+
+    if user not in cache:
+        # Try to get institution from User document (if linked)
+        cache[user] = frappe.db.get_value("User", user, "institution")
+
+    user_institution = cache[user]
     if user_institution:
         return user_institution
 
@@ -462,12 +578,27 @@ def _get_user_institution():
 
 def clear_trial_cache(institution):
     """
-    Clear the cached trial status for an institution.
+    Clear all cached trial data for an institution.
 
     Should be called whenever trial status is updated.
 
     Args:
         institution: Institution name/ID
     """
-    cache_key = f"trial_status_{institution}"
-    frappe.cache().delete_value(cache_key)
+    _clear_trial_cache(institution)
+
+
+def clear_trial_cache_doc(doc, method=None):
+    """
+    Institution on_update hook that clears its cached trial status.
+
+    Args:
+        doc: The Institution document
+        method: The event method name
+    """
+    clear_trial_cache(doc.name)
+
+
+def _trial_status_cache_key(institution):
+    """Cache key for the Institution fields used by get_trial_status."""
+    return f"trial_full_status_{institution}"
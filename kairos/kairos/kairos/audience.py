@@ -12,15 +12,23 @@ import frappe
 from frappe import _
 from typing import List, Optional, Dict, Any
 
+from kairos.kairos.doctype.academic_year.academic_year import AcademicYear
+
+# How long an audience preview stays cached, in seconds
+AUDIENCE_PREVIEW_TTL = 60
+
+# How long cascade selector options stay cached, in seconds
+CASCADE_OPTIONS_TTL = 600
+
+# Joins from an enrollment (`se`) to its Section (`s`) and Grade (`g`)
+_SECTION_JOIN = "INNER JOIN `tabSection` s ON s.name = se.section"
+_GRADE_JOIN = "INNER JOIN `tabGrade` g ON g.name = s.grade"
+
 
 def get_current_academic_year() -> Optional[str]:
-    """Get the currently active Academic Year."""
-    academic_year = frappe.db.get_value(
-        "Academic Year",
-        {"is_current": 1},
-        "name"
-    )
-    return academic_year
+    """Get the currently active Academic Year (cached, see AcademicYear.get_current)."""
+    current = AcademicYear.get_current()
+    return current.name if current else None
 
 
 def resolve_audience_to_students(
@@ -53,95 +61,116 @@ def resolve_audience_to_students(
     if not academic_year:
         frappe.throw(_("No active Academic Year found"))
 
-    # Build section filter based on audience type
-    section_filters = {"academic_year": academic_year}
+    query = _build_enrollment_query(
+        audience_type=audience_type,
+        campus=campus,
+        school_unit=school_unit,
+        grade=grade,
+        section=section,
+        shift=shift,
+        academic_year=academic_year
+    )
+    if query is None:
+        # Custom audience - return empty, caller should handle recipients manually
+        return []
+
+    from_clause, values = query
+
+    # DISTINCT in case a student is enrolled in multiple sections
+    return frappe.db.sql(
+        f"SELECT DISTINCT se.student {from_clause}",
+        values,
+        pluck=True
+    )
+
+
+def _build_enrollment_query(
+    audience_type: str,
+    campus: Optional[str],
+    school_unit: Optional[str],
+    grade: Optional[str],
+    section: Optional[str],
+    shift: Optional[str],
+    academic_year: str,
+    join_guardians: bool = False
+) -> Optional[tuple[str, Dict[str, Any]]]:
+    """
+    Build the FROM/WHERE clause selecting active enrollments for an audience.
+
+    Campus and School Unit are read from the columns denormalized onto
+    Student Enrollment; Section, Grade and School Unit are joined by primary
+    key only where a filter needs them (grade, shift, or the is_active flags
+    of Campus and School Unit audiences), so the whole audience is a single
+    round trip. Enrollments are aliased as `se`; with join_guardians, the
+    Student Guardian links that receive communications are joined as `sg`.
+
+    Returns:
+        Tuple of (SQL fragment, query values), or None for Custom audiences
+    """
+    joins = []
+    conditions = ["se.academic_year = %(academic_year)s", "se.status = 'Active'"]
+    values = {"academic_year": academic_year}
 
     if audience_type == "All School":
-        # No additional section filters - get all sections
+        # No additional filters - every active enrollment
         pass
 
     elif audience_type == "Campus":
         if not campus:
             frappe.throw(_("Campus is required for Campus audience type"))
-        # Get all school units in this campus
-        school_units = frappe.get_all(
-            "School Unit",
-            filters={"campus": campus, "is_active": 1},
-            pluck="name"
-        )
-        if not school_units:
-            return []
-        # Get all grades in these school units
-        grades = frappe.get_all(
-            "Grade",
-            filters={"school_unit": ["in", school_units], "is_active": 1},
-            pluck="name"
-        )
-        if not grades:
-            return []
-        section_filters["grade"] = ["in", grades]
+        # Campus is denormalized onto the enrollment from its Section;
+        # only active School Units and Grades are included
+        joins.append("INNER JOIN `tabSchool Unit` su ON su.name = se.school_unit")
+        joins.append(_SECTION_JOIN)
+        joins.append(_GRADE_JOIN)
+        conditions.append("se.campus = %(campus)s")
+        conditions.append("su.is_active = 1")
+        conditions.append("g.is_active = 1")
+        values["campus"] = campus
 
     elif audience_type == "School Unit":
         if not school_unit:
             frappe.throw(_("School Unit is required for School Unit audience type"))
-        # Get all grades in this school unit
-        grades = frappe.get_all(
-            "Grade",
-            filters={"school_unit": school_unit, "is_active": 1},
-            pluck="name"
-        )
-        if not grades:
-            return []
-        section_filters["grade"] = ["in", grades]
+        # School Unit is denormalized onto the enrollment from its Section;
+        # only active Grades are included
+        joins.append(_SECTION_JOIN)
+        joins.append(_GRADE_JOIN)
+        conditions.append("se.school_unit = %(school_unit)s")
+        conditions.append("g.is_active = 1")
+        values["school_unit"] = school_unit
 
     elif audience_type == "Grade":
         if not grade:
             frappe.throw(_("Grade is required for Grade audience type"))
-        section_filters["grade"] = grade
+        joins.append(_SECTION_JOIN)
+        conditions.append("s.grade = %(grade)s")
+        values["grade"] = grade
 
     elif audience_type == "Section":
         if not section:
             frappe.throw(_("Section is required for Section audience type"))
-        section_filters["name"] = section
+        conditions.append("se.section = %(section)s")
+        values["section"] = section
 
     elif audience_type == "Custom":
-        # Custom audience - return empty, caller should handle recipients manually
-        return []
+        return None
 
     else:
         frappe.throw(_("Invalid audience type: {0}").format(audience_type))
 
-    # Apply shift filter if specified
-    if shift and shift != "All" and audience_type not in ["All School", "Custom"]:
-        section_filters["shift"] = shift
+    # Apply shift filter if specified (stored as the section's schedule type)
+    if shift and shift != "All" and audience_type != "All School":
+        if _SECTION_JOIN not in joins:
+            joins.append(_SECTION_JOIN)
+        conditions.append("s.schedule_type = %(shift)s")
+        values["shift"] = shift
 
-    # Get sections matching filters
-    if "name" in section_filters:
-        # Single section
-        sections = [section_filters["name"]]
-    else:
-        sections = frappe.get_all(
-            "Section",
-            filters=section_filters,
-            pluck="name"
-        )
-
-    if not sections:
-        return []
-
-    # Get active student enrollments for these sections
-    enrollments = frappe.get_all(
-        "Student Enrollment",
-        filters={
-            "section": ["in", sections],
-            "academic_year": academic_year,
-            "status": "Active"
-        },
-        pluck="student"
-    )
+    if join_guardians:
+        joins.append("INNER JOIN `tabStudent Guardian` sg ON sg.student = se.student")
+        conditions.append("sg.can_receive_communications = 1")
 
-    # Remove duplicates (in case student is enrolled in multiple sections)
-    return list(set(enrollments))
+    from_clause = f"FROM `tabStudent Enrollment` se {' '.join(joins)} WHERE {' AND '.join(conditions)}"
+    return from_clause, values
 
 
 def resolve_audience_to_guardians(
@@ -153,7 +182,7 @@ def resolve_audience_to_guardians(
 
     Args:
         students: List of Student document names
-        respect_preferences: If True, only include guardians with receives_communications=1
+        respect_preferences: If True, only include guardians with can_receive_communications=1
 
     Returns:
         List of Guardian document names
@@ -161,23 +190,12 @@ def resolve_audience_to_guardians(
     if not students:
         return []
 
-    guardians = set()
-
-    # Get student-guardian relationships
-    filters = {"student": ["in", students]}
+    # DISTINCT since a guardian is often linked to several of the students
+    sql = "SELECT DISTINCT guardian FROM `tabStudent Guardian` WHERE student IN %(students)s"
     if respect_preferences:
-        filters["receives_communications"] = 1
-
-    student_guardians = frappe.get_all(
-        "Student Guardian",
-        filters=filters,
-        fields=["guardian"]
-    )
-
-    for sg in student_guardians:
-        guardians.add(sg.guardian)
+        sql += " AND can_receive_communications = 1"
 
-    return list(guardians)
+    return frappe.db.sql(sql, {"students": tuple(students)}, pluck=True)
 
 
 def resolve_audience(
@@ -206,7 +224,21 @@ def resolve_audience(
     Returns:
         Dict with "guardians" (always) and "students" (if include_students=True)
     """
-    students = resolve_audience_to_students(
+    if not include_students:
+        # The student list isn't needed, so resolve guardians in one query
+        return {
+            "guardians": _resolve_guardians_direct(
+                audience_type=audience_type,
+                campus=campus,
+                school_unit=school_unit,
+                grade=grade,
+                section=section,
+                shift=shift,
+                academic_year=academic_year
+            )
+        }
+
+    params = dict(
         audience_type=audience_type,
         campus=campus,
         school_unit=school_unit,
@@ -216,13 +248,50 @@ def resolve_audience(
         academic_year=academic_year
     )
 
-    guardians = resolve_audience_to_guardians(students)
+    # Guardians come from the same enrollment join rather than an IN (...)
+    # over the student list, which degrades badly for campus-wide audiences
+    return {
+        "guardians": _resolve_guardians_direct(**params),
+        "students": resolve_audience_to_students(**params)
+    }
 
-    result = {"guardians": guardians}
-    if include_students:
-        result["students"] = students
 
-    return result
+def _resolve_guardians_direct(
+    audience_type: str,
+    campus: Optional[str] = None,
+    school_unit: Optional[str] = None,
+    grade: Optional[str] = None,
+    section: Optional[str] = None,
+    shift: Optional[str] = None,
+    academic_year: Optional[str] = None
+) -> List[str]:
+    """
+    Resolve audience parameters straight to Guardian names.
+
+    Joins Student Guardian onto the enrollment query, avoiding the separate
+    student query and the large IN (...) list of student IDs.
+    """
+    if not academic_year:
+        academic_year = get_current_academic_year()
+
+    if not academic_year:
+        frappe.throw(_("No active Academic Year found"))
+
+    query = _build_enrollment_query(
+        audience_type=audience_type,
+        campus=campus,
+        school_unit=school_unit,
+        grade=grade,
+        section=section,
+        shift=shift,
+        academic_year=academic_year,
+        join_guardians=True
+    )
+    if query is None:
+        return []
+
+    from_clause, values = query
+    return frappe.db.sql(f"SELECT DISTINCT sg.guardian {from_clause}", values, pluck=True)
 
 
 def get_audience_count(
@@ -258,30 +327,24 @@ def get_audience_count(
     if not academic_year:
         return 0
 
-    # For simplicity, we use the full resolution
-    # In production, this could be optimized with COUNT queries
-    if count_type == "students":
-        students = resolve_audience_to_students(
-            audience_type=audience_type,
-            campus=campus,
-            school_unit=school_unit,
-            grade=grade,
-            section=section,
-            shift=shift,
-            academic_year=academic_year
-        )
-        return len(students)
-    else:
-        result = resolve_audience(
-            audience_type=audience_type,
-            campus=campus,
-            school_unit=school_unit,
-            grade=grade,
-            section=section,
-            shift=shift,
-            academic_year=academic_year
-        )
-        return len(result["guardians"])
+    query = _build_enrollment_query(
+        audience_type=audience_type,
+        campus=campus,
+        school_unit=school_unit,
+        grade=grade,
+        section=section,
+        shift=shift,
+        academic_year=academic_year,
+        join_guardians=count_type != "students"
+    )
+    if query is None:
+        return 0
+
+    from_clause, values = query
+
+    # Let the database count instead of materializing the recipient lists
+    column = "se.student" if count_type == "students" else "sg.guardian"
+    return frappe.db.sql(f"SELECT COUNT(DISTINCT {column}) {from_clause}", values)[0][0]
 
 
 def validate_audience_permission(
@@ -311,43 +374,22 @@ def validate_audience_permission(
     Returns:
         True if user has permission, False otherwise
     """
+    scope = _get_user_scope(user)
+
     # System Manager can send to anyone
-    if "System Manager" in frappe.get_roles(user):
+    if "System Manager" in scope["roles"]:
         return True
 
+    staff = scope["staff"]
+    if not staff:
+        return False
+
     # School Admin can send to their school units and below
-    if "School Admin" in frappe.get_roles(user):
+    if "School Admin" in scope["roles"]:
         if audience_type == "All School":
             return False  # Can't send to all school
 
-        # Get user's staff record
-        staff = frappe.db.get_value("Staff", {"user": user}, "name")
-        if not staff:
-            return False
-
-        # Get school units where this staff is director
-        user_school_units = frappe.get_all(
-            "School Unit",
-            filters=[
-                ["director", "=", staff],
-            ],
-            pluck="name"
-        )
-
-        # Also get school units where staff is vice_director or coordinator
-        vice_units = frappe.get_all(
-            "School Unit",
-            filters={"vice_director": staff},
-            pluck="name"
-        )
-        coord_units = frappe.get_all(
-            "School Unit",
-            filters={"coordinator": staff},
-            pluck="name"
-        )
-
-        user_school_units = list(set(user_school_units + vice_units + coord_units))
-
+        user_school_units = scope["school_units"]
         if not user_school_units:
             return False
 
@@ -355,33 +397,21 @@ def validate_audience_permission(
         if audience_type in ["School Unit", "Grade", "Section"]:
             if school_unit:
                 return school_unit in user_school_units
-            elif grade:
-                grade_school_unit = frappe.db.get_value("Grade", grade, "school_unit")
-                return grade_school_unit in user_school_units
-            elif section:
-                section_grade = frappe.db.get_value("Section", section, "grade")
-                if section_grade:
-                    grade_school_unit = frappe.db.get_value("Grade", section_grade, "school_unit")
-                    return grade_school_unit in user_school_units
+            elif grade or section:
+                return _school_unit_for(grade=grade, section=section) in user_school_units
 
         if audience_type == "Campus":
             if campus:
                 # Check if any of user's school units are in this campus
-                campus_school_units = frappe.get_all(
-                    "School Unit",
-                    filters={"campus": campus},
-                    pluck="name"
-                )
-                return any(su in user_school_units for su in campus_school_units)
+                return bool(frappe.db.sql("""
+                    SELECT 1 FROM `tabSchool Unit`
+                    WHERE campus = %s AND name IN %s
+                    LIMIT 1
+                """, (campus, tuple(user_school_units))))
 
         return False
 
     # Teacher can only send to their sections
-    # Get user's staff record
-    staff = frappe.db.get_value("Staff", {"user": user}, "name")
-    if not staff:
-        return False
-
     # Get teacher's assigned sections for current academic year
     academic_year = get_current_academic_year()
     if not academic_year:
@@ -406,6 +436,67 @@ def validate_audience_permission(
     return False
 
 
+def _get_user_scope(user: str) -> Dict[str, Any]:
+    """
+    Get the roles, Staff record and managed School Units of a user.
+
+    Memoized per request on frappe.local, so repeated permission checks for
+    the same user (e.g. a preview followed by a send) don't re-query them.
+
+    Returns:
+        Dict with "roles" (set), "staff" (name or None) and "school_units"
+        (set of School Units where the staff is director, vice director or
+        coordinator; only loaded for School Admins). Staff and School Units
+        are left empty for System Managers.
+    """
+    scopes = getattr(frappe.local, "kairos_audience_scope", None)
+    if scopes is None:
+        scopes = frappe.local.kairos_audience_scope = {}
+
+    scope = scopes.get(user)
+    if scope is not None:
+        return scope
+
+    roles = set(frappe.get_roles(user))
+    staff = None
+    school_units = set()
+
+    # System Managers skip every other check, so their scope stops here
+    if "System Manager" not in roles:
+        staff = frappe.db.get_value("Staff", {"user": user}, "name")
+
+    if staff and "School Admin" in roles:
+        school_units = set(frappe.get_all(
+            "School Unit",
+            or_filters={
+                "director": staff,
+                "vice_director": staff,
+                "coordinator": staff
+            },
+            pluck="name"
+        ))
+
+    scope = scopes[user] = {"roles": roles, "staff": staff, "school_units": school_units}
+    return scope
+
+
+def _school_unit_for(grade: Optional[str] = None, section: Optional[str] = None) -> Optional[str]:
+    """Get the School Unit of a grade, or of a section's grade, in one query."""
+    if grade:
+        return frappe.db.get_value("Grade", grade, "school_unit")
+
+    if section:
+        result = frappe.db.sql("""
+            SELECT g.school_unit
+            FROM `tabSection` s
+            INNER JOIN `tabGrade` g ON g.name = s.grade
+            WHERE s.name = %s
+        """, section)
+        return result[0][0] if result else None
+
+    return None
+
+
 # Whitelisted methods for client-side calls
 @frappe.whitelist()
 def get_audience_preview(
@@ -424,6 +515,13 @@ def get_audience_preview(
     """
     user = frappe.session.user
 
+    cache_key = _audience_preview_cache_key(
+        user, audience_type, campus, school_unit, grade, section, shift
+    )
+    cached = frappe.cache().get_value(cache_key)
+    if cached is not None:
+        return cached
+
     can_send = validate_audience_permission(
         user=user,
         audience_type=audience_type,
@@ -454,11 +552,39 @@ def get_audience_preview(
     else:
         message = _("This will reach {0} families").format(count)
 
-    return {
+    result = {
         "count": count,
         "can_send": can_send,
         "message": message
     }
+    frappe.cache().set_value(cache_key, result, expires_in_sec=AUDIENCE_PREVIEW_TTL)
+
+    return result
+
+
+def _audience_preview_cache_key(user: str, *params: Optional[str]) -> str:
+    """
+    Build the cache key of an audience preview.
+
+    Keys embed a version stamp, so clear_audience_preview_cache can drop
+    every preview at once without scanning Redis for matching keys.
+    """
+    version = frappe.cache().get_value("audience_preview_version")
+    if not version:
+        version = frappe.generate_hash(length=10)
+        frappe.cache().set_value("audience_preview_version", version)
+
+    return f"audience_preview:{version}:{user}:{':'.join(param or '' for param in params)}"
+
+
+def clear_audience_preview_cache() -> None:
+    """
+    Invalidate all cached audience previews.
+
+    Call whenever enrollments or guardian links change. Rotating the version
+    stamp orphans existing entries, which then expire with their TTL.
+    """
+    frappe.cache().delete_value("audience_preview_version")
 
 
 @frappe.whitelist()
@@ -476,6 +602,25 @@ def get_cascade_options(
     Returns:
         List of options for the next level
     """
+    academic_year = get_current_academic_year() if parent_type == "grade" else None
+
+    cache_key = _cascade_options_cache_key(parent_type, parent_value, academic_year)
+    cached = frappe.cache().get_value(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _get_cascade_options(parent_type, parent_value, academic_year)
+    frappe.cache().set_value(cache_key, result, expires_in_sec=CASCADE_OPTIONS_TTL)
+
+    return result
+
+
+def _get_cascade_options(
+    parent_type: str,
+    parent_value: str,
+    academic_year: Optional[str]
+) -> List[Dict[str, str]]:
+    """Query the cascade options for get_cascade_options."""
     if parent_type == "campus":
         # Get school units in this campus
         options = frappe.get_all(
@@ -498,7 +643,6 @@ def get_cascade_options(
 
     elif parent_type == "grade":
         # Get sections in this grade
-        academic_year = get_current_academic_year()
         filters = {"grade": parent_value}
         if academic_year:
             filters["academic_year"] = academic_year
@@ -512,3 +656,22 @@ def get_cascade_options(
         return [{"value": o.name, "label": o.section_name} for o in options]
 
     return []
+
+
+def _cascade_options_cache_key(parent_type: str, *params: Optional[str]) -> str:
+    """Build the cache key of a cascade options lookup (versioned, see clear_cascade_options_cache)."""
+    version = frappe.cache().get_value("audience_cascade_version")
+    if not version:
+        version = frappe.generate_hash(length=10)
+        frappe.cache().set_value("audience_cascade_version", version)
+
+    return f"audience_cascade:{version}:{parent_type}:{':'.join(param or '' for param in params)}"
+
+
+def clear_cascade_options_cache() -> None:
+    """
+    Invalidate all cached cascade options.
+
+    Call whenever a School Unit, Grade or Section changes.
+    """
+    frappe.cache().delete_value("audience_cascade_version")
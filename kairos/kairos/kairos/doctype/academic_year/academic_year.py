@@ -10,6 +10,24 @@ class AcademicYear(Document):
         self.validate_dates()
         self.validate_single_current()
 
+    def db_insert(self, *args, **kwargs):
+        """Insert the record; the unique is_current_flag index backs up validate_single_current."""
+        try:
+            super().db_insert(*args, **kwargs)
+        except frappe.UniqueValidationError:
+            if self.is_current:
+                self.throw_current_year_conflict()
+            raise
+
+    def db_update(self, *args, **kwargs):
+        """Update the record; the unique is_current_flag index backs up validate_single_current."""
+        try:
+            super().db_update(*args, **kwargs)
+        except frappe.UniqueValidationError:
+            if self.is_current:
+                self.throw_current_year_conflict()
+            raise
+
     def validate_dates(self):
         """Ensure end_date is after start_date."""
         if self.start_date and self.end_date:
@@ -19,22 +37,35 @@ class AcademicYear(Document):
     def validate_single_current(self):
         """Ensure only one Academic Year is marked as current."""
         if self.is_current:
-            # Check if another year is already current
-            existing_current = frappe.db.get_value(
-                "Academic Year",
-                {"is_current": 1, "name": ["!=", self.name]},
-                "name"
-            )
+            existing_current = self.get_other_current_year()
             if existing_current:
-                frappe.throw(
-                    f"Academic Year '{existing_current}' is already marked as current. "
-                    "Please unmark it first before setting this year as current."
-                )
+                self.throw_current_year_conflict(existing_current)
+
+    def get_other_current_year(self):
+        """Get the name of another Academic Year marked as current, if any."""
+        return frappe.db.get_value(
+            "Academic Year",
+            {"is_current": 1, "name": ["!=", self.name]},
+            "name"
+        )
+
+    def throw_current_year_conflict(self, existing_current=None):
+        """Raise the error shown when another Academic Year is already current."""
+        existing_current = existing_current or self.get_other_current_year()
+        frappe.throw(
+            f"Academic Year '{existing_current}' is already marked as current. "
+            "Please unmark it first before setting this year as current.",
+            frappe.UniqueValidationError
+        )
 
     def on_update(self):
         """Clear cache when academic year is updated."""
         frappe.cache().delete_key("current_academic_year")
 
+    def on_trash(self):
+        """Clear cache when academic year is deleted."""
+        frappe.cache().delete_key("current_academic_year")
+
     @staticmethod
     def get_current():
         """Get the current academic year."""
@@ -50,6 +81,52 @@ class AcademicYear(Document):
         )
 
         if current:
-            frappe.cache().set_value("current_academic_year", current)
+            frappe.cache().set_value("current_academic_year", current, expires_in_sec=86400)
 
         return current
+
+
+def add_single_current_index():
+    """
+    Add the is_current_flag generated column and its unique index.
+
+    is_current_flag is 1 for the current year and NULL otherwise, so the
+    UNIQUE index allows any number of NULLs but only one current year.
+    If several years are already current they are logged to the Error Log
+    and the index is skipped until an administrator resolves them.
+
+    Returns:
+        bool: True if the index is in place
+    """
+    current_years = frappe.get_all("Academic Year", filters={"is_current": 1}, pluck="name")
+    if len(current_years) > 1:
+        frappe.log_error(
+            "Skipped unique index unique_current_academic_year on Academic Year",
+            "More than one Academic Year is marked as current. Unmark all but one "
+            f"and re-run the migration to add the unique index: {', '.join(current_years)}",
+        )
+        return False
+
+    if not frappe.db.sql("SHOW COLUMNS FROM `tabAcademic Year` LIKE 'is_current_flag'"):
+        frappe.db.sql_ddl(
+            """
+            ALTER TABLE `tabAcademic Year`
+            ADD COLUMN `is_current_flag` TINYINT
+                GENERATED ALWAYS AS (IF(`is_current` = 1, 1, NULL)) VIRTUAL
+            """
+        )
+
+    if not frappe.db.has_index("tabAcademic Year", "unique_current_academic_year"):
+        frappe.db.sql_ddl(
+            """
+            ALTER TABLE `tabAcademic Year`
+            ADD UNIQUE INDEX `unique_current_academic_year` (`is_current_flag`)
+            """
+        )
+
+    return True
+
+
+def on_doctype_update():
+    """Declare the single current year constraint whenever the DocType is synced."""
+    add_single_current_index()
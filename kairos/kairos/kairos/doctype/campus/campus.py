@@ -4,6 +4,8 @@
 import frappe
 from frappe.model.document import Document
 
+from kairos.kairos.utils import validate_email_cached
+
 
 class Campus(Document):
 	# begin: auto-generated types
@@ -75,19 +77,17 @@ class Campus(Document):
 	def validate_email(self):
 		"""Validate email format if provided."""
 		if self.email:
-			frappe.utils.validate_email_address(self.email, throw=True)
+			validate_email_cached(self.email)
 
 	def validate_campus_code(self):
 		"""Ensure campus code is uppercase."""
 		if self.campus_code:
-			self.campus_code = self.campus_code.upper().strip()
+			self.campus_code = self.campus_code.strip().upper()
 
 	def validate_coordinates(self):
 		"""Validate latitude and longitude ranges."""
-		if self.latitude is not None:
-			if self.latitude < -90 or self.latitude > 90:
-				frappe.throw("Latitude must be between -90 and 90 degrees")
+		if self.latitude is not None and abs(self.latitude) > 90:
+			frappe.throw("Latitude must be between -90 and 90 degrees")
 
-		if self.longitude is not None:
-			if self.longitude < -180 or self.longitude > 180:
-				frappe.throw("Longitude must be between -180 and 180 degrees")
+		if self.longitude is not None and abs(self.longitude) > 180:
+			frappe.throw("Longitude must be between -180 and 180 degrees")
@@ -5,6 +5,23 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils import now_datetime
+from kairos.kairos.middleware.trial_access import check_trial_write_access
+from kairos.kairos.utils import add_unique_if_no_duplicates
+
+# Event counter field for each RSVP response
+RSVP_COUNT_FIELDS = {
+	"Yes": "rsvp_yes_count",
+	"No": "rsvp_no_count",
+	"Maybe": "rsvp_maybe_count",
+}
+
+
+def _rsvp_count_key(rsvp):
+	"""Return the (event, counter field) an RSVP is tallied under, or None if not counted."""
+	if not rsvp or rsvp.status == "Cancelled":
+		return None
+	field = RSVP_COUNT_FIELDS.get(rsvp.response)
+	return (rsvp.event, field) if field and rsvp.event else None
 
 
 class EventRSVP(Document):
@@ -42,21 +59,40 @@ class EventRSVP(Document):
 		self.validate_guest_count()
 		self.validate_waitlist_position()
 
+	def db_insert(self, *args, **kwargs):
+		"""Insert the RSVP; the unique (event, guardian) index backs up validate_unique_rsvp."""
+		try:
+			super().db_insert(*args, **kwargs)
+		except frappe.UniqueValidationError:
+			self.throw_duplicate_rsvp()
+
+	def db_update(self, *args, **kwargs):
+		"""Update the RSVP; the unique (event, guardian) index backs up validate_unique_rsvp."""
+		try:
+			super().db_update(*args, **kwargs)
+		except frappe.UniqueValidationError:
+			self.throw_duplicate_rsvp()
+
 	def validate_unique_rsvp(self):
 		"""Ensure only one RSVP per guardian per event."""
-		if self.is_new():
-			existing = frappe.db.exists(
-				"Event RSVP",
-				{
-					"event": self.event,
-					"guardian": self.guardian,
-					"name": ("!=", self.name or "")
-				}
-			)
-			if existing:
-				frappe.throw(
-					_("An RSVP already exists for this guardian and event")
-				)
+		if not self.is_new() and not (
+			self.has_value_changed("event") or self.has_value_changed("guardian")
+		):
+			return
+
+		filters = {"event": self.event, "guardian": self.guardian}
+		if not self.is_new():
+			filters["name"] = ("!=", self.name)
+
+		if frappe.db.exists("Event RSVP", filters):
+			self.throw_duplicate_rsvp()
+
+	def throw_duplicate_rsvp(self):
+		"""Raise the error shown when the guardian already has an RSVP for this event."""
+		frappe.throw(
+			_("An RSVP already exists for this guardian and event"),
+			frappe.UniqueValidationError,
+		)
 
 	def validate_guest_count(self):
 		"""Validate that checked-in guests do not exceed total guests."""
@@ -79,43 +115,108 @@ class EventRSVP(Document):
 
 	def on_update(self):
 		"""Actions after updating the RSVP."""
-		self.update_event_rsvp_count()
+		self.update_event_rsvp_count(self.get_doc_before_save())
 
 	def on_trash(self):
 		"""Actions when RSVP is deleted."""
-		self.update_event_rsvp_count()
-
-	def update_event_rsvp_count(self):
-		"""Update the RSVP count on the related Event."""
-		# Placeholder for updating event statistics
-		# This would be implemented when Event DocType has RSVP count fields
-		pass
+		self.update_event_rsvp_count(self, removed=True)
+
+	def update_event_rsvp_count(self, previous=None, removed=False):
+		"""
+		Apply the change in this RSVP's tally to the related Event's counters.
+
+		Counters are adjusted by delta with an atomic UPDATE, so no recount
+		query is needed and concurrent RSVPs don't overwrite each other.
+		Existing counters were backfilled by the recount_school_event_rsvp_counts
+		patch.
+
+		Args:
+			previous: The RSVP state before the change (None if newly created)
+			removed: True if the RSVP is being deleted
+		"""
+		old_key = _rsvp_count_key(previous)
+		new_key = None if removed else _rsvp_count_key(self)
+		if old_key == new_key:
+			return
+
+		deltas = {}
+		if old_key:
+			deltas.setdefault(old_key[0], {})[old_key[1]] = -1
+		if new_key:
+			deltas.setdefault(new_key[0], {})[new_key[1]] = 1
+
+		for event, field_deltas in deltas.items():
+			assignments = ", ".join(
+				f"{field} = coalesce({field}, 0) + {delta}" for field, delta in field_deltas.items()
+			)
+			frappe.db.sql(f"update `tabSchool Event` set {assignments} where name = %s", event)
 
 	def check_in(self, guests_count=0):
 		"""Mark the RSVP as checked in."""
 		if self.status == "Cancelled":
 			frappe.throw(_("Cannot check in a cancelled RSVP"))
 
-		self.checked_in = 1
-		self.check_in_time = now_datetime()
-		self.checked_in_guests = min(guests_count, self.number_of_guests)
-		self.save(ignore_permissions=True)
+		# Direct update: check-in only touches these fields, so skip the full save
+		self._set_fields(
+			_("Checked in"),
+			checked_in=1,
+			check_in_time=now_datetime(),
+			checked_in_guests=min(guests_count, self.number_of_guests),
+		)
 
 	def promote_from_waitlist(self):
 		"""Promote this RSVP from waitlist to confirmed."""
 		if self.status != "Waitlisted":
 			frappe.throw(_("Only waitlisted RSVPs can be promoted"))
 
-		self.status = "Confirmed"
-		self.promoted_from_waitlist = 1
-		self.promoted_at = now_datetime()
-		self.waitlist_position = 0
-		self.save(ignore_permissions=True)
+		self._set_fields(
+			_("Promoted from waitlist"),
+			status="Confirmed",
+			promoted_from_waitlist=1,
+			promoted_at=now_datetime(),
+			waitlist_position=0,
+		)
 
 	def cancel_rsvp(self):
 		"""Cancel this RSVP."""
 		if self.status == "Cancelled":
 			frappe.throw(_("RSVP is already cancelled"))
 
-		self.status = "Cancelled"
-		self.save(ignore_permissions=True)
+		previous = frappe._dict(event=self.event, response=self.response, status=self.status)
+		self._set_fields(_("Cancelled"), status="Cancelled", waitlist_position=0)
+		self.update_event_rsvp_count(previous)
+
+	def _set_fields(self, action, **values):
+		"""
+		Write known-safe field changes directly and mirror them on the instance.
+
+		Skips validate and the save hooks, so the trial gate normally run on
+		before_save is applied here, and the change is recorded as a comment
+		since it bypasses version tracking.
+		"""
+		check_trial_write_access(self)
+
+		frappe.db.set_value("Event RSVP", self.name, values)
+		self.update(values)
+
+		self.add_comment(
+			"Edit",
+			_("{0}: {1}").format(
+				action, ", ".join(f"{field} = {value}" for field, value in values.items())
+			),
+		)
+
+
+def add_event_guardian_unique_index():
+	"""
+	Add the unique (event, guardian) index unless duplicate RSVPs exist.
+
+	Returns:
+		bool: True if the index is in place
+	"""
+	return add_unique_if_no_duplicates("Event RSVP", ["event", "guardian"], "unique_event_guardian")
+
+
+def on_doctype_update():
+	"""Declare the unique (event, guardian) constraint whenever the DocType is synced."""
+	add_event_guardian_unique_index()
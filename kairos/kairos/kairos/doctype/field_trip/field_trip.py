@@ -43,50 +43,94 @@ class FieldTrip(Document):
 
     def on_update(self):
         """Actions when the field trip is updated."""
-        # Generate Field Trip Student records when trip is approved
-        if self.status == "Approved" and self.has_value_changed("status"):
+        if self.status != "Approved":
+            return
+
+        # Generate Field Trip Student records when trip is approved; the
+        # previous version is already in memory (None for new trips)
+        before = self.get_doc_before_save()
+        if not before or before.status != "Approved":
             self.generate_student_records()
 
     def generate_student_records(self):
         """Create Field Trip Student records for all students in the selected sections."""
-        from frappe.utils import now_datetime
-
         # Check if Field Trip Student DocType exists
         if not frappe.db.exists("DocType", "Field Trip Student"):
             return
 
-        for section_row in self.sections:
-            # Get all enrolled students in this section
-            students = frappe.get_all(
-                "Student Enrollment",
-                filters={
-                    "section": section_row.section,
-                    "academic_year": self.academic_year,
-                    "status": "Active"
-                },
-                fields=["student"]
-            )
+        sections = [row.section for row in self.sections if row.section]
+        if not sections:
+            return
 
-            for student in students:
-                # Check if record already exists
-                existing = frappe.db.exists(
-                    "Field Trip Student",
-                    {
-                        "field_trip": self.name,
-                        "student": student.student
-                    }
-                )
+        # All enrolled students across the selected sections in one query
+        enrollments = frappe.db.sql("""
+            SELECT se.student, se.section, st.full_name
+            FROM `tabStudent Enrollment` se
+            LEFT JOIN `tabStudent` st ON st.name = se.student
+            WHERE se.section IN %(sections)s
+                AND se.academic_year = %(academic_year)s
+                AND se.status = 'Active'
+        """, {"sections": tuple(sections), "academic_year": self.academic_year}, as_dict=True)
+
+        # Skip students already registered for this trip (and students
+        # enrolled in more than one of the selected sections)
+        registered = set(frappe.get_all(
+            "Field Trip Student",
+            filters={"field_trip": self.name},
+            pluck="student"
+        ))
+        new_students = []
+        for enrollment in enrollments:
+            if enrollment.student not in registered:
+                registered.add(enrollment.student)
+                new_students.append(enrollment)
 
-                if not existing:
-                    doc = frappe.get_doc({
-                        "doctype": "Field Trip Student",
-                        "field_trip": self.name,
-                        "student": student.student,
-                        "section": section_row.section,
-                        "authorization_status": "Pending",
-                        "payment_status": "Pending" if self.cost_per_student > 0 else "Not Required"
-                    })
-                    doc.insert(ignore_permissions=True)
+        if not new_students:
+            return
+
+        payment_status = "Pending" if (self.cost_per_student or 0) > 0 else "Not Required"
+
+        if (frappe.get_hooks("doc_events") or {}).get("Field Trip Student"):
+            # Another app hooks into Field Trip Student; insert per row so its hooks run
+            self.insert_student_records(new_students, payment_status)
+        else:
+            self.bulk_insert_student_records(new_students, payment_status)
+
+    def insert_student_records(self, enrollments, payment_status):
+        """Insert a Field Trip Student document per enrollment, running its hooks."""
+        for enrollment in enrollments:
+            frappe.get_doc({
+                "doctype": "Field Trip Student",
+                "field_trip": self.name,
+                "student": enrollment.student,
+                "section": enrollment.section,
+                "authorization_status": "Pending",
+                "payment_status": payment_status
+            }).insert(ignore_permissions=True)
+
+    def bulk_insert_student_records(self, enrollments, payment_status):
+        """Insert the Field Trip Student rows for all enrollments in one statement."""
+        from frappe.utils import now_datetime
+
+        now = now_datetime()
+        user = frappe.session.user
+        fields = [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus",
+            "field_trip", "trip_name", "student", "student_name", "section",
+            "authorization_status", "authorization_method", "payment_status", "attended"
+        ]
+        # bulk_insert skips the document, so fill in what insert() would have:
+        # trip_name/student_name from their fetch_from fields and the
+        # authorization_method/attended defaults in field_trip_student.json
+        values = [
+            (
+                frappe.generate_hash(length=10), now, now, user, user, 0,
+                self.name, self.trip_name, enrollment.student, enrollment.full_name, enrollment.section,
+                "Pending", "App", payment_status, 0
+            )
+            for enrollment in enrollments
+        ]
+        frappe.db.bulk_insert("Field Trip Student", fields, values)
 
     def on_trash(self):
         """Prevent deletion if there are associated Field Trip Student records."""
@@ -0,0 +1,68 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+# Columns both insert paths fill; name, field_trip and timestamps differ by design
+COMPARED_FIELDS = [
+    "trip_name", "student", "student_name", "section", "docstatus",
+    "authorization_status", "authorization_method", "authorization_date",
+    "payment_status", "attended",
+]
+
+
+class TestFieldTrip(FrappeTestCase):
+    def setUp(self):
+        # Raw rows: only the linked records' names and fetched fields matter
+        now = now_datetime()
+        meta = ["creation", "modified", "owner", "modified_by", "docstatus"]
+        meta_values = (now, now, "Administrator", "Administrator", 0)
+
+        self.trip_names = ["_Test Field Trip Bulk", "_Test Field Trip Per Row"]
+        frappe.db.bulk_insert(
+            "Field Trip",
+            ["name", *meta, "trip_name"],
+            [(name, *meta_values, "_Test Museum Visit") for name in self.trip_names],
+        )
+        frappe.db.bulk_insert(
+            "Student",
+            ["name", *meta, "first_name", "last_name", "full_name"],
+            [
+                ("_Test FT Student 1", *meta_values, "Ana", "Diaz", "Ana Diaz"),
+                ("_Test FT Student 2", *meta_values, "Luis", "Gomez", "Luis Gomez"),
+            ],
+        )
+        frappe.db.bulk_insert("Section", ["name", *meta], [("_Test FT Section", *meta_values)])
+
+        self.enrollments = [
+            frappe._dict(student="_Test FT Student 1", section="_Test FT Section", full_name="Ana Diaz"),
+            frappe._dict(student="_Test FT Student 2", section="_Test FT Section", full_name="Luis Gomez"),
+        ]
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def get_trip(self, name):
+        return frappe.get_doc({"doctype": "Field Trip", "name": name, "trip_name": "_Test Museum Visit"})
+
+    def get_rows(self, field_trip):
+        return frappe.get_all(
+            "Field Trip Student",
+            filters={"field_trip": field_trip},
+            fields=COMPARED_FIELDS,
+            order_by="student asc",
+        )
+
+    def test_bulk_insert_matches_per_row_insert(self):
+        bulk_trip, per_row_trip = self.trip_names
+        for payment_status in ("Pending", "Not Required"):
+            frappe.db.delete("Field Trip Student", {"field_trip": ["in", self.trip_names]})
+
+            self.get_trip(bulk_trip).bulk_insert_student_records(self.enrollments, payment_status)
+            self.get_trip(per_row_trip).insert_student_records(self.enrollments, payment_status)
+
+            bulk_rows = self.get_rows(bulk_trip)
+            self.assertEqual(len(bulk_rows), len(self.enrollments))
+            self.assertEqual(bulk_rows, self.get_rows(per_row_trip))
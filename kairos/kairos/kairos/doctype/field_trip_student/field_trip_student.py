@@ -5,6 +5,7 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils import now_datetime
+from kairos.kairos.utils import add_unique_if_no_duplicates
 
 
 class FieldTripStudent(Document):
@@ -13,23 +14,45 @@ class FieldTripStudent(Document):
         self.validate_unique_student_trip()
         self.set_authorization_date()
 
+    def db_insert(self, *args, **kwargs):
+        """Insert the record; the unique (field_trip, student) index backs up validate_unique_student_trip."""
+        try:
+            super().db_insert(*args, **kwargs)
+        except frappe.UniqueValidationError:
+            self.throw_duplicate_student_trip()
+
+    def db_update(self, *args, **kwargs):
+        """Update the record; the unique (field_trip, student) index backs up validate_unique_student_trip."""
+        try:
+            super().db_update(*args, **kwargs)
+        except frappe.UniqueValidationError:
+            self.throw_duplicate_student_trip()
+
     def validate_unique_student_trip(self):
         """Ensure a student can only be enrolled once per field trip."""
-        if self.student and self.field_trip:
-            existing = frappe.db.exists(
-                "Field Trip Student",
-                {
-                    "field_trip": self.field_trip,
-                    "student": self.student,
-                    "name": ["!=", self.name]
-                }
-            )
-            if existing:
-                frappe.throw(
-                    _("Student {0} is already registered for this field trip").format(
-                        self.student_name or self.student
-                    )
-                )
+        if not (self.student and self.field_trip):
+            return
+
+        if not self.is_new() and not (
+            self.has_value_changed("student") or self.has_value_changed("field_trip")
+        ):
+            return
+
+        filters = {"field_trip": self.field_trip, "student": self.student}
+        if not self.is_new():
+            filters["name"] = ["!=", self.name]
+
+        if frappe.db.exists("Field Trip Student", filters):
+            self.throw_duplicate_student_trip()
+
+    def throw_duplicate_student_trip(self):
+        """Raise the error shown when the student is already on this trip."""
+        frappe.throw(
+            _("Student {0} is already registered for this field trip").format(
+                self.student_name or self.student
+            ),
+            frappe.UniqueValidationError
+        )
 
     def set_authorization_date(self):
         """Set authorization date when status changes to Authorized."""
@@ -40,3 +63,20 @@ class FieldTripStudent(Document):
         """Actions when the record is updated."""
         # Update field trip authorization counts (for dashboard stats)
         pass
+
+
+def add_field_trip_student_unique_index():
+    """
+    Add the unique (field_trip, student) index unless duplicate records exist.
+
+    Returns:
+        bool: True if the index is in place
+    """
+    return add_unique_if_no_duplicates(
+        "Field Trip Student", ["field_trip", "student"], "unique_field_trip_student"
+    )
+
+
+def on_doctype_update():
+    """Declare the unique (field_trip, student) constraint whenever the DocType is synced."""
+    add_field_trip_student_unique_index()
@@ -5,6 +5,9 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from kairos.kairos.audience import clear_cascade_options_cache
+from kairos.kairos.doctype.student_enrollment.student_enrollment import sync_enrollment_school_units
+
 
 class Grade(Document):
 	# begin: auto-generated types
@@ -33,6 +36,16 @@ class Grade(Document):
 		self.validate_age_range()
 		self.validate_unique_grade_code_per_campus()
 
+	def on_update(self):
+		"""Keep the School Unit copied onto Student Enrollments in sync."""
+		if self.get_doc_before_save() and self.has_value_changed("school_unit"):
+			sync_enrollment_school_units(grade=self.name)
+
+		clear_cascade_options_cache()
+
+	def on_trash(self):
+		clear_cascade_options_cache()
+
 	def validate_age_range(self):
 		"""Validate that minimum age is less than or equal to maximum age."""
 		if self.age_range_min and self.age_range_max:
@@ -60,3 +73,8 @@ class Grade(Document):
 						self.grade_code, self.campus
 					)
 				)
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index("Grade", ["campus", "grade_code"], "campus_grade_code_index")
@@ -1,8 +1,10 @@
 # Copyright (c) 2024, Kairos and contributors
 # For license information, please see license.txt
 
-import frappe
 from frappe.model.document import Document
+from kairos.kairos.utils import validate_email_cached
+
+_NAME_FIELDS = ("first_name", "middle_name", "last_name")
 
 
 class Guardian(Document):
@@ -47,13 +49,12 @@ class Guardian(Document):
 
 	def set_full_name(self):
 		"""Set full_name by concatenating first_name, middle_name, and last_name."""
-		name_parts = [self.first_name]
-		if self.middle_name:
-			name_parts.append(self.middle_name)
-		name_parts.append(self.last_name)
-		self.full_name = " ".join(name_parts)
+		if self.full_name and not any(map(self.has_value_changed, _NAME_FIELDS)):
+			return
+
+		self.full_name = " ".join(filter(None, (self.first_name, self.middle_name, self.last_name)))
 
 	def validate_email(self):
 		"""Validate email format."""
 		if self.email:
-			frappe.utils.validate_email_address(self.email, throw=True)
+			validate_email_cached(self.email)
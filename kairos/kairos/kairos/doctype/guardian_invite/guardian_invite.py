@@ -4,7 +4,7 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import now_datetime, add_days, get_datetime
+from frappe.utils import now_datetime, add_days, get_datetime, validate_email_address
 
 
 class GuardianInvite(Document):
@@ -50,7 +50,7 @@ class GuardianInvite(Document):
 	def validate_email(self):
 		"""Validate email format."""
 		if self.email:
-			frappe.utils.validate_email_address(self.email, throw=True)
+			validate_email_address(self.email, throw=True)
 
 	def validate_expiration_on_used(self):
 		"""Verify that the invite is not expired if marking as used."""
@@ -97,3 +97,8 @@ class GuardianInvite(Document):
 		self.used_at = now_datetime()
 		self.guardian = guardian_name
 		self.save(ignore_permissions=True)
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index("Guardian Invite", ["used", "expires"], "used_expires_index")
@@ -1,8 +1,13 @@
 # Copyright (c) 2024, Kairos and contributors
 # For license information, please see license.txt
 
+import re
+
 import frappe
 from frappe.model.document import Document
+from kairos.kairos.utils import validate_email_cached
+
+_URL_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
 
 
 class Institution(Document):
@@ -39,10 +44,15 @@ class Institution(Document):
 	def validate_email(self):
 		"""Validate email format if provided."""
 		if self.primary_contact_email:
-			frappe.utils.validate_email_address(self.primary_contact_email, throw=True)
+			validate_email_cached(self.primary_contact_email)
 
 	def validate_website(self):
 		"""Validate and format website URL if provided."""
-		if self.website:
-			if not self.website.startswith(("http://", "https://")):
+		if self.website and (self.is_new() or self.has_value_changed("website")):
+			if not _URL_SCHEME_RE.match(self.website):
 				self.website = "https://" + self.website
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index("Institution", ["is_trial", "trial_status", "trial_expires_at"], "idx_trial")
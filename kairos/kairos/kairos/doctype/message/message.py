@@ -1,10 +1,35 @@
 # Copyright (c) 2025, Kairos and contributors
 # For license information, please see license.txt
 
+import html
+import re
+
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import now_datetime, strip_html
+from frappe.utils import get_datetime, now_datetime
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Required scope fields per scope_type, as (fieldname, label) pairs
+_SCOPE_REQUIREMENTS = {
+	"Institution": (("institution", "Institution"),),
+	"Campus": (("institution", "Institution"), ("campus", "Campus")),
+	"Grade": (("institution", "Institution"), ("campus", "Campus"), ("grade", "Grade")),
+	"Section": (
+		("institution", "Institution"),
+		("campus", "Campus"),
+		("grade", "Grade"),
+		("section", "Section"),
+	),
+	"Group": (("student_group", "Student Group"),),
+	"Individual": (),
+}
+
+
+def html_to_text(content: str) -> str:
+	"""Strip HTML tags from content and decode entities."""
+	return html.unescape(_TAG_RE.sub("", content))
 
 
 class Message(Document):
@@ -55,36 +80,24 @@ class Message(Document):
 
 	def validate_scope_fields(self):
 		"""Validate that required scope fields are set based on scope_type."""
-		scope_requirements = {
-			"Institution": ["institution"],
-			"Campus": ["institution", "campus"],
-			"Grade": ["institution", "campus", "grade"],
-			"Section": ["institution", "campus", "grade", "section"],
-			"Group": ["student_group"],
-			"Individual": []
-		}
-
-		required_fields = scope_requirements.get(self.scope_type, [])
-		for field in required_fields:
-			if not self.get(field):
-				frappe.throw(
-					_("{0} is required when Scope Type is {1}").format(
-						frappe.unscrub(field), self.scope_type
-					)
-				)
+		for field, label in _SCOPE_REQUIREMENTS.get(self.scope_type, ()):
+			if not getattr(self, field, None):
+				frappe.throw(_("{0} is required when Scope Type is {1}").format(label, self.scope_type))
 
 	def validate_scheduled_time(self):
 		"""Validate scheduled time is in the future if status is Scheduled."""
-		if self.status == "Scheduled":
-			if not self.scheduled_time:
-				frappe.throw(_("Scheduled Time is required when status is Scheduled"))
-			if self.scheduled_time <= now_datetime():
-				frappe.throw(_("Scheduled Time must be in the future"))
+		if self.status != "Scheduled":
+			return
+		if not self.scheduled_time:
+			frappe.throw(_("Scheduled Time is required when status is Scheduled"))
+		# scheduled_time may still be a string on unsaved docs, so compare as datetimes
+		if get_datetime(self.scheduled_time) <= now_datetime():
+			frappe.throw(_("Scheduled Time must be in the future"))
 
 	def generate_plain_text_content(self):
 		"""Generate plain text version of content if not provided."""
 		if self.content and not self.content_plain:
-			self.content_plain = strip_html(self.content)
+			self.content_plain = html_to_text(self.content)
 
 	def before_submit(self):
 		"""Actions before submitting the message."""
@@ -134,10 +147,21 @@ class Message(Document):
 
 	def update_tracking_counts(self, delivered=0, read=0, failed=0):
 		"""Update delivery tracking counts."""
-		if delivered:
-			self.delivered_count = (self.delivered_count or 0) + delivered
-		if read:
-			self.read_count = (self.read_count or 0) + read
-		if failed:
-			self.failed_count = (self.failed_count or 0) + failed
-		self.save(ignore_permissions=True)
+		if not (delivered or read or failed):
+			return
+
+		# Atomic increment: no full save, and no lost updates between delivery workers
+		frappe.db.sql(
+			"""
+			update `tabMessage`
+			set delivered_count = coalesce(delivered_count, 0) + %(delivered)s,
+				read_count = coalesce(read_count, 0) + %(read)s,
+				failed_count = coalesce(failed_count, 0) + %(failed)s
+			where name = %(name)s
+			""",
+			{"delivered": delivered, "read": read, "failed": failed, "name": self.name},
+		)
+
+		self.delivered_count = (self.delivered_count or 0) + delivered
+		self.read_count = (self.read_count or 0) + read
+		self.failed_count = (self.failed_count or 0) + failed
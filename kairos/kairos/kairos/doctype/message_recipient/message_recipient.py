@@ -5,6 +5,32 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now_datetime
 
+# Rows per UPDATE in bulk_update_delivery_status, to stay well under max_allowed_packet
+_BULK_UPDATE_CHUNK_SIZE = 500
+
+# Per delivery channel: status column, timestamp column set for each status,
+# and the error column with the statuses that record an error
+_DELIVERY_FIELDS = {
+	"email": {
+		"status": "email_status",
+		"timestamps": {"Sent": "email_sent_at", "Delivered": "email_delivered_at"},
+		"error": "email_error",
+		"error_statuses": ("Failed", "Bounced"),
+	},
+	"sms": {
+		"status": "sms_status",
+		"timestamps": {"Sent": "sms_sent_at"},
+		"error": "sms_error",
+		"error_statuses": ("Failed",),
+	},
+	"push": {
+		"status": "push_status",
+		"timestamps": {"Sent": "push_sent_at"},
+		"error": None,
+		"error_statuses": (),
+	},
+}
+
 
 class MessageRecipient(Document):
 	# begin: auto-generated types
@@ -45,12 +71,7 @@ class MessageRecipient(Document):
 		"""Validate that the guardian is actually related to the student if both are specified."""
 		if self.guardian and self.student:
 			# Check if guardian is linked to this student
-			student_guardians = frappe.get_all(
-				"Student Guardian",
-				filters={"parent": self.student, "guardian": self.guardian},
-				limit=1
-			)
-			if not student_guardians:
+			if not is_guardian_of_student(self.guardian, self.student):
 				frappe.msgprint(
 					frappe._("Guardian {0} may not be linked to Student {1}").format(
 						self.guardian, self.student
@@ -61,42 +82,136 @@ class MessageRecipient(Document):
 
 	def mark_as_read(self):
 		"""Mark the message as read for this recipient."""
+		read_at = now_datetime()
+
+		# Atomic increment so concurrent reads don't lose counts
+		frappe.db.sql(
+			"""
+			update `tabMessage Recipient`
+			set is_read = 1, read_at = %(read_at)s, read_count = coalesce(read_count, 0) + 1
+			where name = %(name)s
+			""",
+			{"read_at": read_at, "name": self.name},
+		)
+
 		self.is_read = 1
-		self.read_at = now_datetime()
+		self.read_at = read_at
 		self.read_count = (self.read_count or 0) + 1
-		self.save(ignore_permissions=True)
 
 	def mark_as_acknowledged(self, note=None):
 		"""Mark the message as acknowledged by this recipient."""
-		self.acknowledged = 1
-		self.acknowledged_at = now_datetime()
+		values = {"acknowledged": 1, "acknowledged_at": now_datetime()}
 		if note:
-			self.acknowledgment_note = note
-		self.save(ignore_permissions=True)
+			values["acknowledgment_note"] = note
+		frappe.db.set_value("Message Recipient", self.name, values, update_modified=False)
+		self.update(values)
 
 	def update_email_status(self, status, error=None):
 		"""Update email delivery status."""
-		self.email_status = status
+		values = {"email_status": status}
 		if status == "Sent":
-			self.email_sent_at = now_datetime()
+			values["email_sent_at"] = now_datetime()
 		elif status == "Delivered":
-			self.email_delivered_at = now_datetime()
+			values["email_delivered_at"] = now_datetime()
 		elif status in ("Failed", "Bounced") and error:
-			self.email_error = error
-		self.save(ignore_permissions=True)
+			values["email_error"] = error
+		frappe.db.set_value("Message Recipient", self.name, values, update_modified=False)
+		self.update(values)
 
 	def update_sms_status(self, status, error=None):
 		"""Update SMS delivery status."""
-		self.sms_status = status
+		values = {"sms_status": status}
 		if status == "Sent":
-			self.sms_sent_at = now_datetime()
+			values["sms_sent_at"] = now_datetime()
 		elif status in ("Failed",) and error:
-			self.sms_error = error
-		self.save(ignore_permissions=True)
+			values["sms_error"] = error
+		frappe.db.set_value("Message Recipient", self.name, values, update_modified=False)
+		self.update(values)
 
 	def update_push_status(self, status):
 		"""Update push notification delivery status."""
-		self.push_status = status
+		values = {"push_status": status}
 		if status == "Sent":
-			self.push_sent_at = now_datetime()
-		self.save(ignore_permissions=True)
+			values["push_sent_at"] = now_datetime()
+		frappe.db.set_value("Message Recipient", self.name, values, update_modified=False)
+		self.update(values)
+
+	@classmethod
+	def bulk_update_delivery_status(cls, channel, updates):
+		"""
+		Update the delivery status of many recipients for one channel.
+
+		Meant for provider callbacks that report hundreds of statuses at once:
+		each chunk of rows is written with a single CASE UPDATE, applying the
+		same timestamp and error rules as update_email_status and friends.
+
+		Args:
+			channel: "email", "sms" or "push"
+			updates: List of dicts with "name", "status" and optionally "error"
+		"""
+		fields = _DELIVERY_FIELDS.get(channel)
+		if not fields:
+			frappe.throw(frappe._("Invalid delivery channel: {0}").format(channel))
+
+		# The rows skip save(), so apply the Select option check it would have run
+		allowed = frappe.get_meta("Message Recipient").get_field(fields["status"]).options.split("\n")
+		invalid = {row["status"] for row in updates} - set(allowed)
+		if invalid:
+			frappe.throw(
+				frappe._("Invalid {0} status: {1}").format(channel, ", ".join(sorted(map(str, invalid))))
+			)
+
+		now = now_datetime()
+		for start in range(0, len(updates), _BULK_UPDATE_CHUNK_SIZE):
+			chunk = updates[start : start + _BULK_UPDATE_CHUNK_SIZE]
+			names = tuple(row["name"] for row in chunk)
+
+			assignments = []
+			values = []
+
+			status_cases = " ".join(["when %s then %s"] * len(chunk))
+			assignments.append(f"{fields['status']} = case name {status_cases} end")
+			for row in chunk:
+				values.extend((row["name"], row["status"]))
+
+			for status, column in fields["timestamps"].items():
+				stamped = tuple(row["name"] for row in chunk if row["status"] == status)
+				if stamped:
+					assignments.append(f"{column} = case when name in %s then %s else {column} end")
+					values.extend((stamped, now))
+
+			errored = [
+				row for row in chunk if row["status"] in fields["error_statuses"] and row.get("error")
+			]
+			if errored:
+				error_cases = " ".join(["when %s then %s"] * len(errored))
+				column = fields["error"]
+				assignments.append(f"{column} = case name {error_cases} else {column} end")
+				for row in errored:
+					values.extend((row["name"], row["error"]))
+
+			values.append(names)
+			frappe.db.sql(
+				f"update `tabMessage Recipient` set {', '.join(assignments)} where name in %s",
+				tuple(values),
+			)
+
+
+def is_guardian_of_student(guardian, student):
+	"""
+	Check whether a Student Guardian link exists, memoized for the request.
+
+	A broadcast validates the same (student, guardian) pair for many
+	recipients, so each pair is only looked up once per request.
+	"""
+	links = getattr(frappe.local, "kairos_student_guardian_links", None)
+	if links is None:
+		links = frappe.local.kairos_student_guardian_links = {}
+
+	key = (student, guardian)
+	if key not in links:
+		links[key] = bool(
+			frappe.db.exists("Student Guardian", {"student": student, "guardian": guardian})
+		)
+
+	return links[key]
@@ -0,0 +1,73 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now_datetime
+
+from kairos.kairos.doctype.message_recipient.message_recipient import MessageRecipient
+
+
+class TestMessageRecipient(FrappeTestCase):
+	def setUp(self):
+		# Raw rows: bulk_update_delivery_status only touches the status columns,
+		# so the linked Message and Guardian don't need to exist
+		now = now_datetime()
+		self.names = [f"_Test MRCP {i}" for i in range(3)]
+		frappe.db.bulk_insert(
+			"Message Recipient",
+			["name", "creation", "modified", "owner", "modified_by", "docstatus",
+				"message", "guardian", "email_status", "sms_status", "push_status"],
+			[
+				(name, now, now, "Administrator", "Administrator", 0,
+					"_Test Message", "_Test Guardian", "Pending", "Pending", "Pending")
+				for name in self.names
+			],
+		)
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def get_row(self, name):
+		return frappe.db.get_value(
+			"Message Recipient",
+			name,
+			["email_status", "email_sent_at", "email_delivered_at", "email_error", "push_status"],
+			as_dict=True,
+		)
+
+	def test_bulk_update_delivery_status(self):
+		sent, delivered, bounced = self.names
+		MessageRecipient.bulk_update_delivery_status(
+			"email",
+			[
+				{"name": sent, "status": "Sent"},
+				{"name": delivered, "status": "Delivered"},
+				{"name": bounced, "status": "Bounced", "error": "Mailbox full"},
+			],
+		)
+
+		row = self.get_row(sent)
+		self.assertEqual(row.email_status, "Sent")
+		self.assertTrue(row.email_sent_at)
+		self.assertIsNone(row.email_delivered_at)
+
+		row = self.get_row(delivered)
+		self.assertEqual(row.email_status, "Delivered")
+		self.assertTrue(row.email_delivered_at)
+		self.assertIsNone(row.email_sent_at)
+
+		row = self.get_row(bounced)
+		self.assertEqual(row.email_status, "Bounced")
+		self.assertEqual(row.email_error, "Mailbox full")
+
+		# Other channels are untouched
+		self.assertEqual(row.push_status, "Pending")
+
+	def test_bulk_update_delivery_status_rejects_unknown_status(self):
+		with self.assertRaises(frappe.ValidationError):
+			MessageRecipient.bulk_update_delivery_status(
+				"sms", [{"name": self.names[0], "status": "Bounced"}]
+			)
+
+		self.assertEqual(frappe.db.get_value("Message Recipient", self.names[0], "sms_status"), "Pending")
@@ -8,13 +8,14 @@ from frappe.model.document import Document
 from frappe.utils import now_datetime, get_datetime
 
 
+_RE_NONWORD = re.compile(r'[^\w\s-]')
+_RE_SEP = re.compile(r'[\s_-]+')
+
+
 def slugify(text: str) -> str:
 	"""Convert text to URL-friendly slug."""
-	text = text.lower().strip()
-	text = re.sub(r'[^\w\s-]', '', text)
-	text = re.sub(r'[\s_-]+', '-', text)
-	text = re.sub(r'^-+|-+$', '', text)
-	return text
+	text = _RE_NONWORD.sub('', text.lower().strip())
+	return _RE_SEP.sub('-', text).strip('-')
 
 
 class News(Document):
@@ -63,10 +64,24 @@ class News(Document):
 		elif self.slug:
 			self.slug = slugify(self.slug)
 
+	def get_parsed_dates(self):
+		"""
+		Get publish_date and unpublish_date as datetimes (or None).
+
+		Parsed once per save and reused by validate_dates and
+		update_status_based_on_dates; re-parsed if either date changes.
+		"""
+		raw = (self.publish_date, self.unpublish_date)
+		parsed = getattr(self, "_parsed_dates", None)
+		if parsed is None or parsed[0] != raw:
+			parsed = self._parsed_dates = (raw, tuple(get_datetime(d) if d else None for d in raw))
+		return parsed[1]
+
 	def validate_dates(self):
 		"""Validate publish and unpublish dates."""
 		if self.publish_date and self.unpublish_date:
-			if get_datetime(self.unpublish_date) <= get_datetime(self.publish_date):
+			publish_dt, unpublish_dt = self.get_parsed_dates()
+			if unpublish_dt <= publish_dt:
 				frappe.throw(_("Unpublish Date must be after Publish Date"))
 
 	def validate_scope(self):
@@ -85,19 +100,35 @@ class News(Document):
 
 	def update_status_based_on_dates(self):
 		"""Update status based on publish/unpublish dates."""
-		now = now_datetime()
-
-		if self.status == "Draft":
+		if self.status == "Draft" or not (self.publish_date or self.unpublish_date):
 			return
 
-		if self.publish_date and self.status == "Scheduled":
-			if get_datetime(self.publish_date) <= now:
+		now = now_datetime()
+		publish_dt, unpublish_dt = self.get_parsed_dates()
+
+		if publish_dt and self.status == "Scheduled":
+			if publish_dt <= now:
 				self.status = "Published"
 
-		if self.unpublish_date and self.status == "Published":
-			if get_datetime(self.unpublish_date) <= now:
+		if unpublish_dt and self.status == "Published":
+			if unpublish_dt <= now:
 				self.status = "Archived"
 
 	def increment_views(self):
 		"""Increment the views count."""
-		frappe.db.set_value("News", self.name, "views_count", self.views_count + 1, update_modified=False)
+		# Atomic increment so concurrent viewers don't overwrite each other's counts
+		frappe.db.sql(
+			"update `tabNews` set views_count = coalesce(views_count, 0) + 1 where name = %s",
+			self.name,
+		)
+
+	@classmethod
+	def bulk_increment_views(cls, names):
+		"""Increment the views count of several News items in one query."""
+		if not names:
+			return
+
+		frappe.db.sql(
+			"update `tabNews` set views_count = coalesce(views_count, 0) + 1 where name in %s",
+			(tuple(names),),
+		)
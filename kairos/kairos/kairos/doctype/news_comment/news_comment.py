@@ -29,6 +29,8 @@ class NewsComment(Document):
 
 	def before_save(self):
 		"""Track edits to the comment."""
+		# has_value_changed compares against the copy Frappe already loads before
+		# every save, so this check costs no extra query.
 		if not self.is_new() and self.has_value_changed("comment"):
 			self.is_edited = 1
 			self.edited_at = now_datetime()
@@ -40,6 +42,6 @@ class NewsComment(Document):
 	def validate_parent_comment(self):
 		"""Ensure parent comment belongs to the same news article."""
 		if self.parent_comment:
-			parent_news = frappe.db.get_value("News Comment", self.parent_comment, "news")
+			parent_news = frappe.get_cached_value("News Comment", self.parent_comment, "news")
 			if parent_news and parent_news != self.news:
 				frappe.throw("Parent comment must belong to the same news article.")
@@ -3,25 +3,37 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.utils import now
 
 
 class SavedView(Document):
 	def validate(self):
 		# Ensure only one default view per doctype per user
 		if self.is_default:
-			frappe.db.set_value(
-				"Saved View",
+			frappe.db.sql(
+				"""
+				update `tabSaved View`
+				set is_default = 0, modified = %(modified)s, modified_by = %(user)s
+				where for_doctype = %(for_doctype)s and owner = %(owner)s
+					and is_default = 1 and name != %(name)s
+				""",
 				{
+					"modified": now(),
+					"user": frappe.session.user,
 					"for_doctype": self.for_doctype,
 					"owner": self.owner,
-					"is_default": 1,
-					"name": ("!=", self.name)
+					"name": self.name or "",
 				},
-				"is_default",
-				0
 			)
 
 	def before_save(self):
 		# Clear favorite_folder if not a favorite
 		if not self.is_favorite:
 			self.favorite_folder = None
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index(
+		"Saved View", ["for_doctype", "owner", "is_default"], "for_doctype_owner_default_index"
+	)
@@ -7,6 +7,9 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import now_datetime, get_datetime
 
+from kairos.kairos.doctype.event_rsvp.event_rsvp import RSVP_COUNT_FIELDS
+from kairos.kairos.utils import validate_email_cached
+
 
 def slugify(text: str) -> str:
 	"""Convert text to URL-friendly slug."""
@@ -75,21 +78,33 @@ class SchoolEvent(Document):
 
 	def validate(self):
 		"""Validate the Event document before saving."""
-		self.validate_dates()
-		self.validate_coordinates()
-		self.validate_scope()
-		self.validate_rsvp_settings()
+		# Only re-run checks whose inputs changed; saves that touch unrelated
+		# fields (counters, descriptions) skip them entirely.
+		if self._any_changed("start_datetime", "end_datetime", "rsvp_enabled", "rsvp_deadline"):
+			self.validate_dates()
+		if self._any_changed("latitude", "longitude"):
+			self.validate_coordinates()
+		if self._any_changed("scope_type", "institution", "campus", "grade", "section"):
+			self.validate_scope()
+		if self._any_changed("rsvp_enabled", "max_attendees", "max_guests_per_rsvp", "reminder_days_before"):
+			self.validate_rsvp_settings()
 		self.generate_slug()
 		self.set_publish_date()
 
+	def _any_changed(self, *fieldnames):
+		"""Return True if the document is new or any of the given fields changed."""
+		return self.is_new() or any(self.has_value_changed(fieldname) for fieldname in fieldnames)
+
 	def validate_dates(self):
 		"""Validate that end datetime is after start datetime."""
+		start = get_datetime(self.start_datetime)
+
 		if self.start_datetime and self.end_datetime:
-			if get_datetime(self.end_datetime) < get_datetime(self.start_datetime):
+			if get_datetime(self.end_datetime) < start:
 				frappe.throw(_("End Date/Time cannot be before Start Date/Time"))
 
 		if self.rsvp_enabled and self.rsvp_deadline:
-			if get_datetime(self.rsvp_deadline) > get_datetime(self.start_datetime):
+			if get_datetime(self.rsvp_deadline) > start:
 				frappe.throw(_("RSVP Deadline must be before the event starts"))
 
 	def validate_coordinates(self):
@@ -115,28 +130,42 @@ class SchoolEvent(Document):
 
 	def validate_rsvp_settings(self):
 		"""Validate RSVP settings."""
-		if self.rsvp_enabled:
-			if self.max_attendees and self.max_attendees < 0:
-				frappe.throw(_("Max Attendees cannot be negative"))
-			if self.max_guests_per_rsvp and self.max_guests_per_rsvp < 0:
-				frappe.throw(_("Max Guests per RSVP cannot be negative"))
-			if self.reminder_days_before and self.reminder_days_before < 0:
-				frappe.throw(_("Reminder Days Before cannot be negative"))
+		if not self.rsvp_enabled:
+			return
+
+		max_attendees = self.max_attendees or 0
+		max_guests = self.max_guests_per_rsvp or 0
+		reminder_days = self.reminder_days_before or 0
+
+		if max_attendees < 0:
+			frappe.throw(_("Max Attendees cannot be negative"))
+		if max_guests < 0:
+			frappe.throw(_("Max Guests per RSVP cannot be negative"))
+		if reminder_days < 0:
+			frappe.throw(_("Reminder Days Before cannot be negative"))
 
 	def generate_slug(self):
 		"""Generate URL-friendly slug from event name if not provided."""
-		if not self.slug and self.event_name:
-			base_slug = slugify(self.event_name)
-			self.slug = self._get_unique_slug(base_slug)
+		# Slugs are sticky once set: renaming the event never reruns slug generation
+		if self.slug or not self.event_name:
+			return
+		self.slug = self._get_unique_slug(slugify(self.event_name))
 
 	def _get_unique_slug(self, base_slug):
 		"""Ensure slug is unique by appending a number if necessary."""
-		slug = base_slug
-		counter = 1
-		while frappe.db.exists("School Event", {"slug": slug, "name": ("!=", self.name or "")}):
-			slug = f"{base_slug}-{counter}"
-			counter += 1
-		return slug
+		# One indexed prefix query, then pick the next free numeric suffix in Python
+		taken = set(
+			frappe.db.sql_list(
+				"select slug from `tabSchool Event` where (slug = %s or slug like %s) and name != %s",
+				(base_slug, f"{base_slug}-%", self.name or ""),
+			)
+		)
+		if base_slug not in taken:
+			return base_slug
+
+		suffix_re = re.compile(rf"^{re.escape(base_slug)}-(\d+)$")
+		suffixes = [int(m.group(1)) for m in map(suffix_re.match, taken) if m]
+		return f"{base_slug}-{max(suffixes, default=0) + 1}"
 
 	def set_publish_date(self):
 		"""Set publish date when status changes to Published."""
@@ -147,11 +176,34 @@ class SchoolEvent(Document):
 		"""Actions before saving the document."""
 		# Validate organizer email format if provided
 		if self.organizer_email:
-			frappe.utils.validate_email_address(self.organizer_email, throw=True)
+			validate_email_cached(self.organizer_email)
+
+		self.refresh_rsvp_counts()
+
+	def refresh_rsvp_counts(self):
+		"""
+		Reload the RSVP counters from the database before writing the event.
+
+		Event RSVP adjusts the counters with atomic deltas; without this, a
+		save would write the counters loaded with the form back over any RSVP
+		recorded since.
+		"""
+		if self.is_new():
+			return
+
+		counts = frappe.db.get_value(
+			"School Event", self.name, list(RSVP_COUNT_FIELDS.values()), as_dict=True
+		)
+		if counts:
+			self.update(counts)
 
 	def increment_views(self):
 		"""Increment the views count for the event."""
-		frappe.db.set_value("School Event", self.name, "views_count", self.views_count + 1, update_modified=False)
+		# Atomic increment so concurrent viewers don't overwrite each other's counts
+		frappe.db.sql(
+			"update `tabSchool Event` set views_count = coalesce(views_count, 0) + 1 where name = %s",
+			self.name,
+		)
 
 	def update_rsvp_counts(self):
 		"""Update RSVP counts from the RSVP child table or related doctype."""
@@ -164,9 +216,9 @@ class SchoolEvent(Document):
 		# Implementation depends on how RSVPs are stored
 		pass
 
-	def is_past_event(self):
+	def is_past_event(self, now=None):
 		"""Check if the event has already ended."""
-		return get_datetime(self.end_datetime) < now_datetime()
+		return get_datetime(self.end_datetime) < (now or now_datetime())
 
 	def is_ongoing(self):
 		"""Check if the event is currently ongoing."""
@@ -179,9 +231,10 @@ class SchoolEvent(Document):
 			return False
 		if self.status != "Published":
 			return False
-		if self.rsvp_deadline and get_datetime(self.rsvp_deadline) < now_datetime():
+		now = now_datetime()
+		if self.rsvp_deadline and get_datetime(self.rsvp_deadline) < now:
 			return False
-		if self.is_past_event():
+		if self.is_past_event(now):
 			return False
 		return True
 
@@ -5,6 +5,16 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from kairos.kairos.audience import clear_cascade_options_cache
+from kairos.kairos.doctype.student_enrollment.student_enrollment import sync_enrollment_school_units
+
+# Spanish display name of each level, used for default unit names
+_LEVEL_MAP = {
+    "Kindergarten": "Jardín",
+    "Primary": "Primaria",
+    "Secondary": "Secundaria"
+}
+
 
 class SchoolUnit(Document):
     def validate(self):
@@ -33,14 +43,16 @@ class SchoolUnit(Document):
     def set_unit_name_if_empty(self):
         """Auto-generate unit_name if not provided."""
         if not self.unit_name and self.campus and self.level:
-            level_map = {
-                "Kindergarten": "Jardín",
-                "Primary": "Primaria",
-                "Secondary": "Secundaria"
-            }
-            level_name = level_map.get(self.level, self.level)
+            level_name = _LEVEL_MAP.get(self.level, self.level)
             self.unit_name = f"{level_name} {self.campus}"
 
+    def on_update(self):
+        """Keep the Campus copied onto Student Enrollments in sync."""
+        if self.get_doc_before_save() and self.has_value_changed("campus"):
+            sync_enrollment_school_units(school_unit=self.name)
+
+        clear_cascade_options_cache()
+
     def on_trash(self):
         """Prevent deletion if there are associated Grades."""
         grades = frappe.get_all(
@@ -53,3 +65,11 @@ class SchoolUnit(Document):
                 _("Cannot delete School Unit {0} as it has associated Grades. "
                   "Please delete or reassign the Grades first.").format(self.name)
             )
+
+        clear_cascade_options_cache()
+
+
+def on_doctype_update():
+    """Declare the composite indexes whenever the DocType is synced."""
+    frappe.db.add_index("School Unit", ["campus", "is_active"], "campus_is_active_index")
+    frappe.db.add_index("School Unit", ["campus", "level"], "campus_level_index")
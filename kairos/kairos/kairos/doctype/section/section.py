@@ -4,6 +4,9 @@
 import frappe
 from frappe.model.document import Document
 
+from kairos.kairos.audience import clear_cascade_options_cache
+from kairos.kairos.doctype.student_enrollment.student_enrollment import sync_enrollment_school_units
+
 
 class Section(Document):
 	# begin: auto-generated types
@@ -33,6 +36,16 @@ class Section(Document):
 		self.validate_max_students()
 		self.validate_teachers()
 
+	def on_update(self):
+		"""Keep the School Unit copied onto Student Enrollments in sync."""
+		if self.get_doc_before_save() and self.has_value_changed("grade"):
+			sync_enrollment_school_units(section=self.name)
+
+		clear_cascade_options_cache()
+
+	def on_trash(self):
+		clear_cascade_options_cache()
+
 	def validate_max_students(self):
 		"""Ensure max_students is a positive number if provided."""
 		if self.max_students and self.max_students < 0:
@@ -43,3 +56,8 @@ class Section(Document):
 		if self.homeroom_teacher and self.assistant_teacher:
 			if self.homeroom_teacher == self.assistant_teacher:
 				frappe.throw("Homeroom Teacher and Assistant Teacher cannot be the same person")
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index("Section", ["grade", "schedule_type"], "grade_schedule_type_index")
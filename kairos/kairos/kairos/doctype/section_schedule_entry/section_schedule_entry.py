@@ -34,7 +34,7 @@ class SectionScheduleEntry(Document):
     def validate_staff_conflict(self):
         """Check if staff is already assigned to another section at the same time."""
         if self.staff:
-            existing = frappe.db.exists(
+            existing_section = frappe.db.get_value(
                 "Section Schedule Entry",
                 {
                     "staff": self.staff,
@@ -42,15 +42,29 @@ class SectionScheduleEntry(Document):
                     "day_of_week": self.day_of_week,
                     "time_slot": self.time_slot,
                     "name": ["!=", self.name]
-                }
+                },
+                "section"
             )
-            if existing:
-                existing_doc = frappe.get_doc("Section Schedule Entry", existing)
+            if existing_section:
                 frappe.throw(
                     _("Staff {0} is already scheduled for {1} on {2} at {3}").format(
                         self.staff_name or self.staff,
-                        existing_doc.section,
+                        existing_section,
                         self.day_of_week,
                         self.time_slot
                     )
                 )
+
+
+def on_doctype_update():
+    """Declare the composite indexes whenever the DocType is synced."""
+    frappe.db.add_index(
+        "Section Schedule Entry",
+        ["section", "academic_year", "day_of_week", "time_slot"],
+        "section_year_day_slot_index",
+    )
+    frappe.db.add_index(
+        "Section Schedule Entry",
+        ["staff", "academic_year", "day_of_week", "time_slot"],
+        "staff_year_day_slot_index",
+    )
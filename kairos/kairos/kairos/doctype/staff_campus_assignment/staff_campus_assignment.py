@@ -32,6 +32,24 @@ class StaffCampusAssignment(Document):
 		self.validate_primary_assignment()
 		self.validate_instructor_role()
 
+	def db_insert(self, *args, **kwargs):
+		"""Insert the record; the unique primary_active_key index backs up validate_primary_assignment."""
+		try:
+			super().db_insert(*args, **kwargs)
+		except frappe.UniqueValidationError:
+			if self.is_primary and self.is_active:
+				self.throw_duplicate_primary()
+			raise
+
+	def db_update(self, *args, **kwargs):
+		"""Update the record; the unique primary_active_key index backs up validate_primary_assignment."""
+		try:
+			super().db_update(*args, **kwargs)
+		except frappe.UniqueValidationError:
+			if self.is_primary and self.is_active:
+				self.throw_duplicate_primary()
+			raise
+
 	def validate_dates(self):
 		"""Ensure end_date is after start_date if provided."""
 		if self.end_date and self.start_date:
@@ -51,11 +69,17 @@ class StaffCampusAssignment(Document):
 				},
 			)
 			if existing_primary:
-				frappe.throw(
-					_("User {0} already has a primary campus assignment. Please unmark the existing primary assignment first.").format(
-						self.user
-					)
-				)
+				self.throw_duplicate_primary()
+
+	def throw_duplicate_primary(self):
+		"""Raise the error shown when the user already has a primary campus assignment."""
+		frappe.throw(
+			_(
+				"User {0} already has a primary campus assignment. "
+				"Please unmark the existing primary assignment first."
+			).format(self.user),
+			frappe.UniqueValidationError,
+		)
 
 	def validate_instructor_role(self):
 		"""Warn if instructor is linked but role is not Teacher."""
@@ -67,3 +91,60 @@ class StaffCampusAssignment(Document):
 				indicator="orange",
 				alert=True,
 			)
+
+
+def add_primary_active_index():
+	"""
+	Add the primary_active_key generated column and its unique index.
+
+	primary_active_key holds the user for active primary assignments and NULL
+	otherwise, so the UNIQUE index allows any number of NULLs but each user
+	only once. If a user already has several active primary assignments they
+	are logged to the Error Log and the index is skipped.
+
+	Returns:
+		bool: True if the index is in place
+	"""
+	duplicates = frappe.db.sql_list(
+		"""
+		SELECT user
+		FROM `tabStaff Campus Assignment`
+		WHERE is_primary = 1 AND is_active = 1
+		GROUP BY user
+		HAVING COUNT(*) > 1
+		"""
+	)
+	if duplicates:
+		frappe.log_error(
+			"Skipped unique index unique_primary_active_assignment on Staff Campus Assignment",
+			"Some users have more than one active primary Staff Campus Assignment. Unmark all but "
+			f"one and re-run the migration to add the unique index: {', '.join(duplicates)}",
+		)
+		return False
+
+	if not frappe.db.has_column("Staff Campus Assignment", "primary_active_key"):
+		frappe.db.sql_ddl(
+			"""
+			ALTER TABLE `tabStaff Campus Assignment`
+			ADD COLUMN `primary_active_key` VARCHAR(140)
+				GENERATED ALWAYS AS (IF(`is_primary` = 1 AND `is_active` = 1, `user`, NULL)) VIRTUAL
+			"""
+		)
+
+	if not frappe.db.has_index("tabStaff Campus Assignment", "unique_primary_active_assignment"):
+		frappe.db.sql_ddl(
+			"""
+			ALTER TABLE `tabStaff Campus Assignment`
+			ADD UNIQUE INDEX `unique_primary_active_assignment` (`primary_active_key`)
+			"""
+		)
+
+	return True
+
+
+def on_doctype_update():
+	"""Declare the single active primary constraint and lookup index whenever the DocType is synced."""
+	add_primary_active_index()
+	frappe.db.add_index(
+		"Staff Campus Assignment", ["user", "is_primary", "is_active"], "user_primary_active_index"
+	)
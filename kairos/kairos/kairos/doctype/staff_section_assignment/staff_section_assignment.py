@@ -35,3 +35,12 @@ class StaffSectionAssignment(Document):
                 frappe.throw(
                     _("An active assignment already exists for this staff, section, academic year, and assignment type combination.")
                 )
+
+
+def on_doctype_update():
+    """Declare the composite indexes whenever the DocType is synced."""
+    frappe.db.add_index(
+        "Staff Section Assignment",
+        ["staff", "section", "academic_year", "assignment_type", "is_active"],
+        "staff_section_year_index",
+    )
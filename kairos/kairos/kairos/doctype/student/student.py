@@ -1,8 +1,8 @@
 # Copyright (c) 2024, Kairos and contributors
 # For license information, please see license.txt
 
-import frappe
 from frappe.model.document import Document
+from kairos.kairos.utils import validate_email_cached
 
 
 class Student(Document):
@@ -48,13 +48,17 @@ class Student(Document):
 
 	def set_full_name(self):
 		"""Set full_name by combining first_name, middle_name, and last_name."""
-		name_parts = [self.first_name]
+		if self.full_name and not any(
+			self.has_value_changed(field) for field in ("first_name", "middle_name", "last_name")
+		):
+			return
+
 		if self.middle_name:
-			name_parts.append(self.middle_name)
-		name_parts.append(self.last_name)
-		self.full_name = " ".join(name_parts)
+			self.full_name = f"{self.first_name} {self.middle_name} {self.last_name}"
+		else:
+			self.full_name = f"{self.first_name} {self.last_name}"
 
 	def validate_email(self):
 		"""Validate email format if provided."""
 		if self.student_email:
-			frappe.utils.validate_email_address(self.student_email, throw=True)
+			validate_email_cached(self.student_email)
@@ -5,12 +5,21 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from kairos.kairos.audience import clear_audience_preview_cache
+
 
 class StudentEnrollment(Document):
     def validate(self):
         """Validate the Student Enrollment document before saving."""
         self.validate_duplicate_enrollment()
         self.validate_withdrawal_fields()
+        self.set_school_unit_and_campus()
+
+    def on_update(self):
+        clear_audience_preview_cache()
+
+    def on_trash(self):
+        clear_audience_preview_cache()
 
     def validate_duplicate_enrollment(self):
         """Check for duplicate active enrollments for the same student in the same year."""
@@ -35,3 +44,75 @@ class StudentEnrollment(Document):
         """Ensure withdrawal fields are filled when status is Withdrawn."""
         if self.status == "Withdrawn" and not self.withdrawal_date:
             frappe.throw(_("Withdrawal Date is required when status is 'Withdrawn'"))
+
+    def set_school_unit_and_campus(self):
+        """Copy the Section's School Unit and Campus onto the enrollment for audience queries."""
+        if not self.section:
+            self.school_unit = self.campus = None
+            return
+
+        if not (self.is_new() or self.has_value_changed("section") or not self.school_unit):
+            return
+
+        hierarchy = frappe.db.sql("""
+            SELECT g.school_unit, su.campus
+            FROM `tabSection` s
+            INNER JOIN `tabGrade` g ON g.name = s.grade
+            LEFT JOIN `tabSchool Unit` su ON su.name = g.school_unit
+            WHERE s.name = %s
+        """, self.section)
+
+        self.school_unit, self.campus = hierarchy[0] if hierarchy else (None, None)
+
+
+def sync_enrollment_school_units(section=None, grade=None, school_unit=None):
+    """
+    Refresh the denormalized school_unit and campus of Student Enrollments.
+
+    Called when a Section, Grade or School Unit moves within the hierarchy.
+    Without a filter, every enrollment is refreshed.
+
+    Args:
+        section: Only enrollments in this Section
+        grade: Only enrollments in Sections of this Grade
+        school_unit: Only enrollments in Grades of this School Unit
+    """
+    if section:
+        condition, value = "se.section = %s", section
+    elif grade:
+        condition, value = "s.grade = %s", grade
+    elif school_unit:
+        condition, value = "g.school_unit = %s", school_unit
+    else:
+        condition, value = "1 = 1", None
+
+    frappe.db.sql(f"""
+        UPDATE `tabStudent Enrollment` se
+        INNER JOIN `tabSection` s ON s.name = se.section
+        INNER JOIN `tabGrade` g ON g.name = s.grade
+        LEFT JOIN `tabSchool Unit` su ON su.name = g.school_unit
+        SET se.school_unit = g.school_unit, se.campus = su.campus
+        WHERE {condition}
+    """, (value,) if value else ())
+
+    clear_audience_preview_cache()
+
+
+def on_doctype_update():
+    """Declare the composite indexes whenever the DocType is synced."""
+    frappe.db.add_index(
+        "Student Enrollment", ["academic_year", "campus", "status"], "academic_year_campus_status_index"
+    )
+    frappe.db.add_index(
+        "Student Enrollment",
+        ["academic_year", "school_unit", "status"],
+        "academic_year_school_unit_status_index"
+    )
+    frappe.db.add_index(
+        "Student Enrollment",
+        ["academic_year", "status", "section", "student"],
+        "academic_year_status_section_student_index"
+    )
+    frappe.db.add_index(
+        "Student Enrollment", ["student", "academic_year", "status"], "student_academic_year_status_index"
+    )
@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from kairos.kairos.audience import clear_audience_preview_cache
+
 
 class StudentGuardian(Document):
 	# begin: auto-generated types
@@ -27,57 +29,57 @@ class StudentGuardian(Document):
 	# end: auto-generated types
 
 	def validate(self):
-		self.validate_duplicate()
-		self.validate_primary_guardian()
+		related = self.get_related_links()
+		self.validate_duplicate(related)
+		self.validate_primary_guardian(related)
 
-	def validate_duplicate(self):
-		"""Ensure the same student-guardian combination doesn't exist twice."""
-		if self.is_new():
-			existing = frappe.db.exists(
-				"Student Guardian",
-				{
-					"student": self.student,
-					"guardian": self.guardian,
-				},
-			)
-		else:
-			existing = frappe.db.exists(
-				"Student Guardian",
-				{
-					"student": self.student,
-					"guardian": self.guardian,
-					"name": ("!=", self.name),
-				},
-			)
+	def on_update(self):
+		clear_audience_preview_cache()
+
+	def on_trash(self):
+		clear_audience_preview_cache()
+
+	def get_related_links(self):
+		"""
+		Get the other links of this student that matter for validation.
+
+		Returns the links to the same guardian (duplicates) and the primary
+		guardian link in one query, instead of one lookup per check.
+		"""
+		if not self.student:
+			return []
 
-		if existing:
+		# New links are named {student}-{guardian} before validate, so a
+		# duplicate shares its name with the existing row: only exclude our
+		# own row once it is in the database
+		exclude_self = "" if self.is_new() else "and name != %(name)s"
+
+		return frappe.db.sql(
+			f"""
+			select name, guardian, is_primary
+			from `tabStudent Guardian`
+			where student = %(student)s
+				and (guardian = %(guardian)s or is_primary = 1)
+				{exclude_self}
+			""",
+			{"student": self.student, "guardian": self.guardian, "name": self.name},
+			as_dict=True,
+		)
+
+	def validate_duplicate(self, related):
+		"""Ensure the same student-guardian combination doesn't exist twice."""
+		if any(row.guardian == self.guardian for row in related):
 			frappe.throw(
 				_("A relationship between Student {0} and Guardian {1} already exists.").format(
 					frappe.bold(self.student), frappe.bold(self.guardian)
 				)
 			)
 
-	def validate_primary_guardian(self):
+	def validate_primary_guardian(self, related):
 		"""Ensure only one primary guardian per student."""
 		if self.is_primary:
 			# Check if another primary guardian exists for this student
-			if self.is_new():
-				existing_primary = frappe.db.exists(
-					"Student Guardian",
-					{
-						"student": self.student,
-						"is_primary": 1,
-					},
-				)
-			else:
-				existing_primary = frappe.db.exists(
-					"Student Guardian",
-					{
-						"student": self.student,
-						"is_primary": 1,
-						"name": ("!=", self.name),
-					},
-				)
+			existing_primary = next((row.name for row in related if row.is_primary), None)
 
 			if existing_primary:
 				# Unset the previous primary guardian
@@ -88,3 +90,13 @@ class StudentGuardian(Document):
 					),
 					alert=True,
 				)
+
+
+def on_doctype_update():
+	"""Declare the composite indexes whenever the DocType is synced."""
+	frappe.db.add_index(
+		"Student Guardian",
+		["student", "can_receive_communications", "guardian"],
+		"student_communications_guardian_index",
+	)
+	frappe.db.add_index("Student Guardian", ["student", "guardian"], "student_guardian_index")
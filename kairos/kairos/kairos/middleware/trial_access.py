@@ -12,9 +12,11 @@ import frappe
 from frappe import _
 from frappe.utils import now_datetime, get_datetime
 
+from kairos.kairos.utils import get_user_roles
+
 # DocTypes that are always allowed even when trial is expired
 # These are essential for system operation and user management
-ALWAYS_ALLOWED_DOCTYPES = [
+ALWAYS_ALLOWED_DOCTYPES = frozenset([
     # System DocTypes
     "User",
     "Role",
@@ -44,11 +46,11 @@ ALWAYS_ALLOWED_DOCTYPES = [
 
     # Allow Institution to be viewed (for checking trial status)
     "Institution",
-]
+])
 
 # DocTypes that should trigger trial check (main application data)
 # If empty, all non-allowed doctypes will be checked
-TRIAL_PROTECTED_DOCTYPES = [
+TRIAL_PROTECTED_DOCTYPES = frozenset([
     # Core Kairos DocTypes
     "Student",
     "Guardian",
@@ -67,14 +69,22 @@ TRIAL_PROTECTED_DOCTYPES = [
     "Event RSVP",
 
     # Add other application-specific DocTypes here
-]
+])
+
+# Prefixes of every per-institution trial cache key, cleared together by
+# clear_trial_cache
+TRIAL_CACHE_KEY_PREFIXES = (
+    "trial_expired_",      # is_trial_expired
+    "trial_status_",       # api.trial.check_trial_access
+    "trial_full_status_",  # api.trial.get_trial_status
+)
 
 
 def check_trial_write_access(doc, method=None):
     """
     DocType event hook to check if write operations are allowed.
 
-    This function is called before insert, save, submit, cancel, and trash
+    This function is called before save (including insert) and trash
     operations to verify that the user's institution has an active trial
     or paid subscription.
 
@@ -85,15 +95,9 @@ def check_trial_write_access(doc, method=None):
     Raises:
         frappe.PermissionError: If trial is expired and write is not allowed
     """
-    # Skip for Guest or Administrator
-    if frappe.session.user in ("Guest", "Administrator"):
-        return
-
-    # Skip for System Manager role (admins can always modify)
-    if "System Manager" in frappe.get_roles():
-        return
-
-    # Get the doctype name
+    # Get the doctype name. This hook fires for every write on the site
+    # (Version, Comment, logs, ...), so filter by doctype before anything
+    # that touches the session, roles or cache.
     doctype = doc.doctype if hasattr(doc, "doctype") else doc.get("doctype")
 
     if not doctype:
@@ -107,8 +111,25 @@ def check_trial_write_access(doc, method=None):
     if TRIAL_PROTECTED_DOCTYPES and doctype not in TRIAL_PROTECTED_DOCTYPES:
         return
 
-    # Check if trial is expired for user's institution
-    if is_trial_expired_for_user():
+    # Skip for Guest or Administrator
+    if frappe.session.user in ("Guest", "Administrator"):
+        return
+
+    # Skip for System Manager role (admins can always modify)
+    if "System Manager" in get_user_roles():
+        return
+
+    # Check if trial is expired for user's institution. The result is kept
+    # on frappe.local so repeated writes in one request check it only once.
+    checked = getattr(frappe.local, "kairos_trial_expired_for_user", None)
+    if checked is None:
+        checked = frappe.local.kairos_trial_expired_for_user = {}
+
+    user = frappe.session.user
+    if user not in checked:
+        checked[user] = is_trial_expired_for_user()
+
+    if checked[user]:
         frappe.throw(
             _(
                 "Your trial period has expired. You cannot create or modify records. "
@@ -297,8 +318,7 @@ def clear_trial_cache(institution):
     Args:
         institution: Institution name/ID
     """
-    frappe.cache().delete_value(f"trial_expired_{institution}")
-    frappe.cache().delete_value(f"trial_status_{institution}")
+    frappe.cache().delete_value([f"{prefix}{institution}" for prefix in TRIAL_CACHE_KEY_PREFIXES])
 
 
 def clear_user_institution_cache(user=None):
@@ -334,7 +354,7 @@ def get_trial_access_info():
             "message": None
         }
 
-    if "System Manager" in frappe.get_roles():
+    if "System Manager" in get_user_roles():
         return {
             "has_full_access": True,
             "is_trial": False,
@@ -12,6 +12,8 @@ import frappe
 from frappe import _
 from frappe.utils import now_datetime, add_days, getdate, get_datetime
 
+from kairos.kairos.middleware.trial_access import clear_trial_cache
+
 # Trial configuration constants
 TRIAL_DURATION_DAYS = 14
 TRIAL_WARNING_DAYS = 3
@@ -45,7 +47,7 @@ def check_trial_expirations():
         fields=["name", "institution_name", "primary_contact_email", "trial_expires_at"]
     )
 
-    expired_count = 0
+    expired_names = []
 
     for institution in expired_institutions:
         try:
@@ -66,7 +68,7 @@ def check_trial_expirations():
                 f"Trial expired for institution: {institution.institution_name} ({institution.name})"
             )
 
-            expired_count += 1
+            expired_names.append(institution.name)
 
         except Exception as e:
             frappe.log_error(
@@ -76,6 +78,12 @@ def check_trial_expirations():
 
     frappe.db.commit()
 
+    # set_value skips the Institution on_update hook, so clear the cached
+    # trial status explicitly once the new status is committed
+    for name in expired_names:
+        clear_trial_cache(name)
+
+    expired_count = len(expired_names)
     frappe.logger().info(f"Trial expiration check completed. {expired_count} trials expired.")
 
     return {"expired_count": expired_count}
@@ -283,6 +291,7 @@ def initialize_trial(institution_name, duration_days=None):
     )
 
     frappe.db.commit()
+    clear_trial_cache(institution_name)
 
     return {
         "institution": institution_name,
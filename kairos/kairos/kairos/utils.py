@@ -0,0 +1,102 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Shared helpers for Kairos DocType controllers and API modules.
+"""
+
+from functools import lru_cache
+
+import frappe
+from frappe.utils import validate_email_address
+
+
+@lru_cache(maxsize=4096)
+def validate_email_cached(email: str) -> bool:
+    """
+    Validate an email address, memoizing addresses that passed.
+
+    Validation is a pure function of the address, so repeated saves with the
+    same email (e.g. a shared organizer during a bulk import) skip the
+    validator. Invalid addresses raise and are not cached.
+
+    No data feeds the result, so a migrate cannot make an entry stale. The
+    cache is per worker process and starts empty when workers restart after
+    a deploy, which is also the only time a new validator can be loaded.
+
+    Args:
+        email: Email address to validate
+
+    Returns:
+        bool: True if the address is valid
+
+    Raises:
+        frappe.InvalidEmailAddressError: If the address is invalid
+    """
+    validate_email_address(email, throw=True)
+    return True
+
+
+def get_user_roles() -> set:
+    """
+    Get the current user's roles as a set, memoized for the request.
+
+    The set is stored on frappe.local (reset for every request) and keyed by
+    user, so role guards can do O(1) membership tests without calling
+    frappe.get_roles() each time.
+
+    Returns:
+        set: Role names of the current session user
+    """
+    roles_by_user = getattr(frappe.local, "kairos_user_roles", None)
+    if roles_by_user is None:
+        roles_by_user = frappe.local.kairos_user_roles = {}
+
+    user = frappe.session.user
+    roles = roles_by_user.get(user)
+    if roles is None:
+        roles = roles_by_user[user] = set(frappe.get_roles(user))
+
+    return roles
+
+
+def add_unique_if_no_duplicates(doctype: str, fields: list, constraint_name: str) -> bool:
+    """
+    Add a unique constraint unless existing rows already violate it.
+
+    Duplicate rows are never removed: each offending group is written to the
+    Error Log and the constraint is skipped, so an administrator can resolve
+    them and re-run the migration.
+
+    Args:
+        doctype: DocType to constrain
+        fields: Columns that must be unique together
+        constraint_name: Name of the unique index
+
+    Returns:
+        bool: True if the constraint is in place, False if it was skipped
+    """
+    columns = ", ".join(f"`{field}`" for field in fields)
+    duplicates = frappe.db.sql(
+        f"""
+        SELECT {columns}, GROUP_CONCAT(name ORDER BY name SEPARATOR ', ') AS names
+        FROM `tab{doctype}`
+        GROUP BY {columns}
+        HAVING COUNT(*) > 1
+        """,
+        as_dict=True,
+    )
+
+    if duplicates:
+        groups = "\n".join(
+            ", ".join(f"{field}={row[field]}" for field in fields) + f": {row.names}" for row in duplicates
+        )
+        frappe.log_error(
+            f"Skipped unique index {constraint_name} on {doctype}",
+            f"{len(duplicates)} group(s) of duplicate {doctype} records must be resolved "
+            f"before the unique index can be added:\n{groups}",
+        )
+        return False
+
+    frappe.db.add_unique(doctype, fields, constraint_name=constraint_name)
+    return True
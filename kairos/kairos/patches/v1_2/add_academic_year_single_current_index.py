@@ -0,0 +1,19 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Academic Year Single Current Index
+
+Enforces at most one current Academic Year at the database level with a
+virtual is_current_flag column and a UNIQUE index on it (see
+academic_year.add_single_current_index). If several years are already
+marked current they are logged to the Error Log and the index is skipped.
+New sites get the index from academic_year.on_doctype_update.
+"""
+
+from kairos.kairos.doctype.academic_year.academic_year import add_single_current_index
+
+
+def execute():
+    """Add the is_current_flag generated column and its unique index to Academic Year."""
+    add_single_current_index()
@@ -0,0 +1,24 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Audience Indexes
+
+Adds composite indexes for the joins and filters run by audience
+resolution: guardians of a set of students, sections of a grade by
+schedule, and school units of a campus. New sites get them from each
+DocType's on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add composite indexes used by audience resolution."""
+    frappe.db.add_index(
+        "Student Guardian",
+        ["student", "can_receive_communications", "guardian"],
+        "student_communications_guardian_index",
+    )
+    frappe.db.add_index("Section", ["grade", "schedule_type"], "grade_schedule_type_index")
+    frappe.db.add_index("School Unit", ["campus", "is_active"], "campus_is_active_index")
@@ -0,0 +1,25 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Event RSVP Unique Index
+
+Enforces one RSVP per guardian per event at the database level with a
+UNIQUE (event, guardian) index, replacing the plain index added by
+add_validation_indexes. If duplicate RSVPs already exist they are logged to
+the Error Log and the index is skipped; nothing is deleted. New sites get the
+index from event_rsvp.on_doctype_update.
+"""
+
+import frappe
+
+from kairos.kairos.doctype.event_rsvp.event_rsvp import add_event_guardian_unique_index
+
+
+def execute():
+    """Add the unique (event, guardian) index to Event RSVP unless duplicates exist."""
+    if not add_event_guardian_unique_index():
+        return
+
+    if frappe.db.has_index("tabEvent RSVP", "event_guardian_index"):
+        frappe.db.sql("ALTER TABLE `tabEvent RSVP` DROP INDEX `event_guardian_index`")
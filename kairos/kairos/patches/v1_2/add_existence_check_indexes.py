@@ -0,0 +1,35 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Existence Check Indexes
+
+Adds composite indexes matching the frappe.db.exists checks run on every
+validate() of Student Guardian, Staff Campus Assignment, Student Enrollment,
+Section Schedule Entry and School Unit, so each check is an index probe
+instead of a scan. New sites get them from each DocType's on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add composite indexes used by duplicate and conflict checks."""
+    frappe.db.add_index("Student Guardian", ["student", "guardian"], "student_guardian_index")
+    frappe.db.add_index(
+        "Staff Campus Assignment", ["user", "is_primary", "is_active"], "user_primary_active_index"
+    )
+    frappe.db.add_index(
+        "Student Enrollment", ["student", "academic_year", "status"], "student_academic_year_status_index"
+    )
+    frappe.db.add_index(
+        "Section Schedule Entry",
+        ["section", "academic_year", "day_of_week", "time_slot"],
+        "section_year_day_slot_index",
+    )
+    frappe.db.add_index(
+        "Section Schedule Entry",
+        ["staff", "academic_year", "day_of_week", "time_slot"],
+        "staff_year_day_slot_index",
+    )
+    frappe.db.add_index("School Unit", ["campus", "level"], "campus_level_index")
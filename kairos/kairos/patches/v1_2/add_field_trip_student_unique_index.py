@@ -0,0 +1,19 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Field Trip Student Unique Index
+
+Enforces one Field Trip Student record per student per field trip at the
+database level with a UNIQUE (field_trip, student) index. If duplicate
+records already exist they are logged to the Error Log and the index is
+skipped; nothing is deleted. New sites get the index from
+field_trip_student.on_doctype_update.
+"""
+
+from kairos.kairos.doctype.field_trip_student.field_trip_student import add_field_trip_student_unique_index
+
+
+def execute():
+    """Add the unique (field_trip, student) index unless duplicates exist."""
+    add_field_trip_student_unique_index()
@@ -0,0 +1,17 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Guardian Invite Status Index
+
+Adds a composite index on (used, expires) so the Pending/Expired filters
+in list_invitations can use an index range scan instead of a table scan.
+New sites get the index from guardian_invite.on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add the (used, expires) index to Guardian Invite."""
+    frappe.db.add_index("Guardian Invite", ["used", "expires"], "used_expires_index")
@@ -0,0 +1,18 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Ensure Guardian Invite Token Index
+
+Every invitation endpoint resolves invites by token. The DocType marks
+token as unique, but sites whose table predates that flag may lack the
+index. Uses the same constraint name Frappe gives unique fields, so this
+is a no-op where the index already exists.
+"""
+
+import frappe
+
+
+def execute():
+    """Ensure the unique index on Guardian Invite.token exists."""
+    frappe.db.add_unique("Guardian Invite", ["token"], constraint_name="token")
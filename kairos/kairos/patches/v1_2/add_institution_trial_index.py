@@ -0,0 +1,18 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Institution Trial Index
+
+Adds a composite index on (is_trial, trial_status, trial_expires_at) so the
+daily trial expiration and warning tasks can find active trials by expiry
+with an index range scan instead of a table scan. New sites get the index
+from institution.on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add the (is_trial, trial_status, trial_expires_at) index to Institution."""
+    frappe.db.add_index("Institution", ["is_trial", "trial_status", "trial_expires_at"], "idx_trial")
@@ -0,0 +1,19 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Saved View Default Index
+
+Adds a composite index on (for_doctype, owner, is_default) so unsetting the
+previous default view when a new one is marked default is an index range
+scan. New sites get the index from saved_view.on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add the (for_doctype, owner, is_default) index to Saved View."""
+    frappe.db.add_index(
+        "Saved View", ["for_doctype", "owner", "is_default"], "for_doctype_owner_default_index"
+    )
@@ -0,0 +1,19 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Staff Campus Assignment Primary Unique Index
+
+Enforces at most one active primary campus assignment per user at the
+database level with a virtual primary_active_key column and a UNIQUE index
+on it (see staff_campus_assignment.add_primary_active_index). Skipped (and
+logged) if a user already has several active primary assignments. New sites
+get the index from staff_campus_assignment.on_doctype_update.
+"""
+
+from kairos.kairos.doctype.staff_campus_assignment.staff_campus_assignment import add_primary_active_index
+
+
+def execute():
+    """Add the primary_active_key generated column and its unique index to Staff Campus Assignment."""
+    add_primary_active_index()
@@ -0,0 +1,22 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Student Enrollment Section Index
+
+Adds a covering index on (academic_year, status, section, student) so
+SELECT DISTINCT student lookups for Section and Grade audiences are answered
+from the index without reading the enrollment rows. New sites get the
+index from student_enrollment.on_doctype_update.
+"""
+
+import frappe
+
+
+def execute():
+    """Add the (academic_year, status, section, student) index to Student Enrollment."""
+    frappe.db.add_index(
+        "Student Enrollment",
+        ["academic_year", "status", "section", "student"],
+        "academic_year_status_section_student_index"
+    )
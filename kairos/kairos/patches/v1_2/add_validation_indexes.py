@@ -0,0 +1,25 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Add Validation Indexes
+
+Adds composite indexes matching the duplicate checks run on every
+validate() of Event RSVP, Grade and Staff Section Assignment, so each
+check is an index lookup instead of a scan. New sites get the Grade and
+Staff Section Assignment indexes from their on_doctype_update; Event RSVP's
+is superseded by the unique index from add_event_rsvp_unique_index.
+"""
+
+import frappe
+
+
+def execute():
+    """Add composite indexes used by duplicate validations."""
+    frappe.db.add_index("Event RSVP", ["event", "guardian"], "event_guardian_index")
+    frappe.db.add_index("Grade", ["campus", "grade_code"], "campus_grade_code_index")
+    frappe.db.add_index(
+        "Staff Section Assignment",
+        ["staff", "section", "academic_year", "assignment_type", "is_active"],
+        "staff_section_year_index",
+    )
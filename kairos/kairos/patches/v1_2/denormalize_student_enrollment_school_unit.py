@@ -0,0 +1,29 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Denormalize School Unit and Campus onto Student Enrollment
+
+Backfills the new school_unit and campus columns from each enrollment's
+Section -> Grade -> School Unit chain and indexes them, so Campus and
+School Unit audiences can filter enrollments without joining the hierarchy.
+New sites get the indexes from student_enrollment.on_doctype_update.
+"""
+
+import frappe
+
+from kairos.kairos.doctype.student_enrollment.student_enrollment import sync_enrollment_school_units
+
+
+def execute():
+    """Backfill and index Student Enrollment school_unit/campus."""
+    sync_enrollment_school_units()
+
+    frappe.db.add_index(
+        "Student Enrollment", ["academic_year", "campus", "status"], "academic_year_campus_status_index"
+    )
+    frappe.db.add_index(
+        "Student Enrollment",
+        ["academic_year", "school_unit", "status"],
+        "academic_year_school_unit_status_index"
+    )
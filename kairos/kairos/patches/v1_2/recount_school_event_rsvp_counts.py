@@ -0,0 +1,34 @@
+# Copyright (c) 2025, Kairos and contributors
+# For license information, please see license.txt
+
+"""
+Patch: Recount School Event RSVP Counts
+
+School Event RSVP counters are now maintained by deltas from Event RSVP,
+but they were never filled in before. Recount rsvp_yes_count, rsvp_no_count
+and rsvp_maybe_count from the non-cancelled RSVPs of each event so the
+deltas start from correct totals.
+"""
+
+import frappe
+
+
+def execute():
+    """Recount the RSVP counters of every School Event."""
+    frappe.db.sql(
+        """
+        UPDATE `tabSchool Event` e
+        LEFT JOIN (
+            SELECT event,
+                SUM(response = 'Yes') AS yes_count,
+                SUM(response = 'No') AS no_count,
+                SUM(response = 'Maybe') AS maybe_count
+            FROM `tabEvent RSVP`
+            WHERE status != 'Cancelled'
+            GROUP BY event
+        ) r ON r.event = e.name
+        SET e.rsvp_yes_count = COALESCE(r.yes_count, 0),
+            e.rsvp_no_count = COALESCE(r.no_count, 0),
+            e.rsvp_maybe_count = COALESCE(r.maybe_count, 0)
+        """
+    )
@@ -1,6 +1,6 @@
 import frappe
 from frappe import _
-from frappe.utils import now_datetime, getdate
+from frappe.utils import add_days, now_datetime, getdate
 
 def get_context(context):
     """Get context for Events page."""
@@ -43,7 +43,7 @@ def get_context(context):
         "School Event",
         filters=[
             ["status", "=", "Published"],
-            ["start_datetime", ">=", frappe.utils.add_days(now, -7)]  # Include events from last 7 days
+            ["start_datetime", ">=", add_days(now, -7)]  # Include events from last 7 days
         ],
         fields=[
             "name", "event_name", "slug", "summary", "featured_image",